@@ -1,6 +1,7 @@
 from contextlib import contextmanager
 from dotenv import load_dotenv
 import psycopg2
+import psycopg2.extensions
 import psycopg2.pool  # Import the pool module
 import os
 import threading  # For thread lock during initialization
@@ -14,6 +15,14 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(
 logger = logging.getLogger(__name__)
 
 
+class PreparedStatementConnection(psycopg2.extensions.connection):
+    """Connection that remembers which server-side prepared statements it already holds."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared_statements = set()
+
+
 class DB:
     _pool = None  # Holds the connection pool instance
     _pool_lock = threading.Lock()  # Lock for thread-safe initialization
@@ -40,12 +49,8 @@ class DB:
                 cls._pool = psycopg2.pool.ThreadedConnectionPool(
                     minconn=min_conn,
                     maxconn=max_conn,
-                    host=db_host,
-                    user=db_user,
-                    password=os.getenv("DB_PASSWORD"),
-                    dbname=db_name,
-                    port=os.getenv("DB_PORT", 5432)
-                    # Add other psycopg2 connection params if needed (e.g., sslmode)
+                    connection_factory=PreparedStatementConnection,
+                    **cls._connection_params()
                 )
                 logger.info("DB connection pool initialized successfully.")
             except psycopg2.OperationalError as e:
@@ -58,6 +63,29 @@ class DB:
         else:
             logger.warning("Pool initialization called when pool already exists.")
 
+    @staticmethod
+    def _connection_params():
+        """Connection keyword arguments shared by the pool and dedicated connections."""
+        return {
+            "host": os.getenv("DB_HOST"),
+            "user": os.getenv("DB_USER"),
+            "password": os.getenv("DB_PASSWORD"),
+            "dbname": os.getenv("DB_NAME"),
+            "port": os.getenv("DB_PORT", 5432),
+            # Add other psycopg2 connection params if needed (e.g., sslmode)
+        }
+
+    @classmethod
+    def open_dedicated_connection(cls):
+        """
+        Opens a standalone autocommit connection outside the pool, for session-scoped state
+        (e.g. advisory locks) that must stay on one connection. The caller owns and closes it.
+        """
+        load_dotenv()
+        conn = psycopg2.connect(**cls._connection_params())
+        conn.autocommit = True
+        return conn
+
     @classmethod
     def get_pool(cls):
         """
@@ -99,8 +127,15 @@ class DB:
             # Handle pool errors specifically (e.g., pool exhausted)
             raise RuntimeError(f"Database pool error: {pe}") from pe
         except psycopg2.errors.lookup(UNIQUE_VIOLATION_CODE) as e:
-            logger.error(f"Unique constraint violation: {e}")
-            acquired = False
+            # Expected in several callers (duplicate names, lock keys); roll back so the pooled
+            # connection is not handed out again inside an aborted transaction, then let the caller handle it.
+            logger.info(f"Unique constraint violation: {e}")
+            if conn:
+                try:
+                    conn.rollback()
+                except Exception as rb_e:
+                    logger.error(f"Error during transaction rollback: {rb_e}", exc_info=True)
+            raise
         except Exception as e:
             logger.error(f"DB operation failed: {e}", exc_info=True)  # Log exception info
             if conn:
@@ -120,11 +155,32 @@ class DB:
             if conn:
                 try:
                     # Return the connection to the pool VERY IMPORTANT
-                    pool.putconn(conn)
+                    # Broken connections are discarded so the pool opens a fresh one instead of reusing them
+                    pool.putconn(conn, close=bool(conn.closed))
                     logger.debug("DB connection returned to pool.")
                 except Exception as p_e:
                     logger.error(f"Error returning connection to pool: {p_e}", exc_info=True)
 
+    @staticmethod
+    def execute_prepared(cursor, name: str, query: str, params: tuple = ()):
+        """
+        Executes `query` (written with $1..$n placeholders) as a server-side prepared statement.
+        The statement is PREPAREd the first time a pooled connection sees `name` and only
+        EXECUTEd afterwards, so Postgres parses and plans it once per connection.
+        Results are read from `cursor` as usual.
+        `name` must be a plain identifier; it is double-quoted, so reserved words are safe too.
+        """
+        if not name.isidentifier():
+            raise ValueError(f"Invalid prepared statement name: {name!r}")
+        prepared = cursor.connection.prepared_statements
+        if name not in prepared:
+            cursor.execute(f'PREPARE "{name}" AS {query}')
+            prepared.add(name)
+        if params:
+            cursor.execute(f'EXECUTE "{name}" ({", ".join(["%s"] * len(params))})', params)
+        else:
+            cursor.execute(f'EXECUTE "{name}"')
+
     @classmethod
     def close_pool(cls):
         """Closes all connections in the pool. Call during application shutdown."""
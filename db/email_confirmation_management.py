@@ -1,4 +1,8 @@
+import logging
 import os
+import secrets
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone  # Added timezone
 
 from simple_mailer import PasscodeLinkMailer, EmailSendingError, EmailSendingAuthError, EmailSendingConnectionError
@@ -6,17 +10,86 @@ import psycopg2.errors  # For specific error handling if needed
 
 from db.DB import DB  # Assuming DB.py is in a 'db' subdirectory
 
+logger = logging.getLogger(__name__)
+
 # --- Constants ---
 CONFIRMATION_VALIDITY_MINUTES = 10
-EMAIL_SEND_DELAY_SECONDS = 3
+EMAIL_SEND_ATTEMPTS = int(os.getenv("EMAIL_SEND_ATTEMPTS", 3))
+EMAIL_SEND_RETRY_BACKOFF_SECONDS = 2
+EMAIL_BODY_TEMPLATE = (
+    "<p>Hello {full_name},</p>"
+    "<p>Thank you for registering! We're excited to have you.</p>"
+    "<p>Please click the button below to confirm your email address and activate your account. "
+    "This link is valid for {validity_duration}.</p>"
+)
+
+# Dedicated worker threads for SMTP sends, keeping them off the request thread
+_EMAIL_EXECUTOR = ThreadPoolExecutor(max_workers=int(os.getenv("EMAIL_SEND_WORKERS", 2)),
+                                     thread_name_prefix="email-sender")
+# Single worker for cleanup writes that don't need to block the response
+_CLEANUP_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="confirmation-cleanup")
+
+
+class _PresetPasscodeMailer(PasscodeLinkMailer):
+    """
+    PasscodeLinkMailer that sends a passcode chosen by the caller instead of generating one,
+    so the Email_Confirmation row can be stored before the email goes out.
+    """
+
+    def __init__(self, passcode: str, **kwargs):
+        super().__init__(**kwargs)
+        self._preset_passcode = passcode
+
+    def _generate_passcode(self, length: int = 24) -> str:
+        return self._preset_passcode
+
+
+def _send_confirmation(mailer: PasscodeLinkMailer, email: str):
+    """
+    Background task: sends the confirmation email, retrying with exponential backoff.
+    Authentication errors are not retried. Runs on _EMAIL_EXECUTOR, so failures are only logged;
+    the stored Email_Confirmation row still expires through the usual inactive-login flow.
+    """
+    for attempt in range(1, EMAIL_SEND_ATTEMPTS + 1):
+        try:
+            # delay_seconds=0 sends synchronously, so SMTP errors reach this thread
+            mailer.send(recipient_email=email, delay_seconds=0)
+            logger.info("Confirmation email sent to %s (attempt %d).", email, attempt)
+            return
+        except EmailSendingAuthError:
+            logger.exception("Failed to send confirmation email to %s: SMTP authentication failed.", email)
+            return
+        except (EmailSendingError, EmailSendingConnectionError):
+            if attempt == EMAIL_SEND_ATTEMPTS:
+                logger.exception("Failed to send confirmation email to %s after %d attempts.", email, attempt)
+                return
+            logger.warning("Sending confirmation email to %s failed (attempt %d), retrying.", email, attempt)
+        except Exception:
+            logger.exception("An unexpected error occurred while sending confirmation email to %s.", email)
+            return
+        time.sleep(EMAIL_SEND_RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1))
+
+
+def _delete_confirmation(passcode: str):
+    """
+    Background task: removes a consumed or expired Email_Confirmation row.
+    Runs on _CLEANUP_EXECUTOR, so failures are only logged.
+    """
+    try:
+        with DB.get_cursor() as cur:
+            cur.execute('DELETE FROM "Email_Confirmation" WHERE passcode = %s', (passcode,))
+    except Exception:
+        logger.exception("Error deleting confirmation record for passcode %s.", passcode)
 
 
 def send_registration_confirmation_email(user_id: int, email: str, first_name: str, last_name: str):
     """
-    Sends a registration confirmation email to the user.
-    Stores the generated passcode and the current UTC timestamp in the Email_Confirmation table.
+    Stores a confirmation passcode for the user and queues the confirmation email.
+    The Email_Confirmation row is written on the request thread; only the SMTP send
+    (with its retries) runs on a background thread.
+    Returns a tuple: (queued (bool), error_message (str or None))
     """
-    passcode_sent = None
+    queued = False
     error_message = None
 
     gmail_sender = os.getenv("GMAIL_SENDER_EMAIL")
@@ -27,18 +100,16 @@ def send_registration_confirmation_email(user_id: int, email: str, first_name: s
 
     if not gmail_sender or not gmail_password:
         error_message = "Email server not configured (missing GMAIL_SENDER_EMAIL or GMAIL_APP_PASSWORD)."
-        print(f"TODO: {error_message}")
+        logger.error(error_message)
     else:
         try:
-            full_name = f"{first_name} {last_name}"
-            email_body_template_for_mailer = (
-                f"<p>Hello {full_name},</p>"
-                "<p>Thank you for registering! We're excited to have you.</p>"
-                "<p>Please click the button below to confirm your email address and activate your account. "
-                "This link is valid for {validity_duration}.</p>"
-            )
+            passcode = secrets.token_urlsafe(24)
+
+            # Only {full_name} is filled here; the mailer substitutes {validity_duration} itself
+            email_body_template_for_mailer = EMAIL_BODY_TEMPLATE.replace("{full_name}", f"{first_name} {last_name}")
 
-            mailer = PasscodeLinkMailer(
+            mailer = _PresetPasscodeMailer(
+                passcode,
                 sender_email=gmail_sender,
                 gmail_app_password=gmail_password,
                 subject="Welcome! Please Confirm Your Email",
@@ -47,8 +118,6 @@ def send_registration_confirmation_email(user_id: int, email: str, first_name: s
                 confirmation_link_base=app_confirmation_url
             )
 
-            passcode = mailer.send(recipient_email=email, delay_seconds=EMAIL_SEND_DELAY_SECONDS)
-
             with DB.get_cursor() as cur:
                 # Explicitly set created_at with Python's current UTC time
                 created_at_now_utc = datetime.now(timezone.utc)
@@ -56,17 +125,16 @@ def send_registration_confirmation_email(user_id: int, email: str, first_name: s
                     'INSERT INTO "Email_Confirmation" (passcode, user_id, timer, created_at) VALUES (%s, %s, %s, %s)',
                     (passcode, user_id, CONFIRMATION_VALIDITY_MINUTES, created_at_now_utc)
                 )
-            passcode_sent = passcode
-            print(f"Confirmation email initiated for {email}. Passcode: {passcode}")
 
-        except (EmailSendingError, EmailSendingAuthError, EmailSendingConnectionError) as mail_e:
-            error_message = f"Failed to send confirmation email to {email}: {mail_e}"
-            print(f"TODO: {error_message}")
+            _EMAIL_EXECUTOR.submit(_send_confirmation, mailer, email)
+            queued = True
+            logger.info("Confirmation email queued for %s.", email)
+
         except Exception as e_generic:
-            error_message = f"An unexpected error occurred during email confirmation for {email}: {e_generic}"
-            print(f"TODO: {error_message}")
+            error_message = f"An unexpected error occurred while preparing confirmation email for {email}: {e_generic}"
+            logger.exception("An unexpected error occurred while preparing confirmation email for %s.", email)
 
-    return passcode_sent, error_message
+    return queued, error_message
 
 
 def confirm_user_email(passcode_from_link: str):
@@ -94,8 +162,8 @@ def confirm_user_email(passcode_from_link: str):
                 # Ensure created_at_ts_from_db is in UTC.
                 if created_at_ts_from_db.tzinfo is None:
                     created_at_utc = created_at_ts_from_db.replace(tzinfo=timezone.utc)
-                    print(
-                        f"TODO: Warning - created_at timestamp for passcode {passcode_from_link} was naive. Assuming UTC.")
+                    logger.warning("created_at timestamp for passcode %s was naive. Assuming UTC.",
+                                   passcode_from_link)
                 else:
                     created_at_utc = created_at_ts_from_db.astimezone(timezone.utc)
 
@@ -106,7 +174,7 @@ def confirm_user_email(passcode_from_link: str):
                 if now_utc > expiration_time_utc:
                     response_dict["reason"] = "Confirmation code has expired."
                     http_status_code = 410
-                    cur.execute('DELETE FROM "Email_Confirmation" WHERE passcode = %s', (passcode_from_link,))
+                    _CLEANUP_EXECUTOR.submit(_delete_confirmation, passcode_from_link)
                 else:
                     cur.execute(
                         'UPDATE "User" SET active = TRUE WHERE user_id = %s AND active = FALSE RETURNING user_id',
@@ -125,12 +193,12 @@ def confirm_user_email(passcode_from_link: str):
                         if user_status_row and user_status_row[0] is True:
                             response_dict = {"status": "success", "message": "Account already active."}
                             http_status_code = 200
-                            cur.execute('DELETE FROM "Email_Confirmation" WHERE passcode = %s', (passcode_from_link,))
+                            _CLEANUP_EXECUTOR.submit(_delete_confirmation, passcode_from_link)
                         else:
                             response_dict["reason"] = "Failed to activate account. User not found or other issue."
                             http_status_code = 500
-    except Exception as e:
-        print(f"TODO: Error during email confirmation for passcode {passcode_from_link}: {e}")
+    except Exception:
+        logger.exception("Error during email confirmation for passcode %s.", passcode_from_link)
         response_dict["reason"] = "An internal error occurred during confirmation."
         http_status_code = 500
 
@@ -160,8 +228,7 @@ def handle_inactive_user_login_attempt(user_id: int):
 
                 if created_at_ts_from_db.tzinfo is None:
                     created_at_utc = created_at_ts_from_db.replace(tzinfo=timezone.utc)
-                    print(
-                        f"TODO: Warning - created_at timestamp for user {user_id} confirmation was naive. Assuming UTC.")
+                    logger.warning("created_at timestamp for user %s confirmation was naive. Assuming UTC.", user_id)
                 else:
                     created_at_utc = created_at_ts_from_db.astimezone(timezone.utc)
 
@@ -189,8 +256,8 @@ def handle_inactive_user_login_attempt(user_id: int):
                     "status": "failed",
                     "reason": "Account didnt activate in time, and was deleted, please register again."
                 }
-    except Exception as e:
-        print(f"TODO: Error in handle_inactive_user_login_attempt for user_id {user_id}: {e}")
+    except Exception:
+        logger.exception("Error in handle_inactive_user_login_attempt for user_id %s.", user_id)
         response_dict = {"status": "failed", "reason": "Server error handling inactive account."}
         http_status_code = 500
 
@@ -1,132 +1,282 @@
 # group_item_management.py
-import psycopg2.errors
+import logging
 from datetime import datetime
+from psycopg2.extras import RealDictCursor
 
+from db.DB import DB
 
-def add_video_to_group(cursor, group_id: int, video_id: int, item_order: int):
+logger = logging.getLogger(__name__)
+
+# Items of several groups at once (%s is the list of group ids), selected as typed values for _format_item_values
+_GROUP_VIDEOS_SQL = '''
+    SELECT gvi.group_id, v.video_id, v.name, v.youtube_id, v.description, v.length, v.upload_by,
+           v.added_date AS video_added_date, gvi.added_at AS added_to_group_at, gvi.item_order
+    FROM "Group_Video_Item" gvi
+    JOIN "Video" v ON gvi.video_id = v.video_id
+    WHERE gvi.group_id = ANY(%s)
+    ORDER BY gvi.group_id, gvi.item_order ASC, gvi.added_at ASC
+'''
+_GROUP_PLAYLISTS_SQL = '''
+    SELECT gpi.group_id, p.playlist_id, p.playlist_name, p.permission,
+           p.user_id AS playlist_owner_id, gpi.added_at AS added_to_group_at, gpi.item_order
+    FROM "Group_Playlist_Item" gpi
+    JOIN "Playlist" p ON gpi.playlist_id = p.playlist_id
+    WHERE gpi.group_id = ANY(%s)
+    ORDER BY gpi.group_id, gpi.item_order ASC, gpi.added_at ASC
+'''
+
+
+# item_type -> (junction table, item id column)
+_ITEM_TABLES = {
+    "video": ('"Group_Video_Item"', "video_id"),
+    "playlist": ('"Group_Playlist_Item"', "playlist_id"),
+}
+
+# Per-item-type statements run as server-side prepared statements (DB.execute_prepared), hence $n placeholders.
+# Creates the user's group if it doesn't exist yet, with the DDL defaults: $1 user_id, $2 group_name.
+_ENSURE_USER_GROUP_SQL = '''
+    INSERT INTO "Group" (user_id, group_name) VALUES ($1, $2)
+    ON CONFLICT (user_id, group_name) DO NOTHING
+'''
+# Adds an item to an existing group of the user: $1 user_id, $2 group_name, $3 item id.
+# next_item_order is only bumped when the item is not in the group yet, so a repeated add neither
+# consumes an order slot nor rewrites the "Group" row; the UPDATE's row lock serializes concurrent adds.
+_ADD_ITEM_TO_USER_GROUP_SQL = {
+    item_type: f'''
+        WITH g AS (
+            UPDATE "Group" SET next_item_order = next_item_order + 1
+            WHERE user_id = $1 AND group_name = $2
+              AND NOT EXISTS (
+                  SELECT 1 FROM {junction_table_name} t
+                  WHERE t.group_id = "Group".group_id AND t.{id_column_name} = $3
+              )
+            RETURNING group_id, next_item_order - 1 AS assigned_order
+        )
+        INSERT INTO {junction_table_name} (group_id, {id_column_name}, item_order)
+        SELECT group_id, $3::integer, assigned_order FROM g
+        RETURNING item_order
+    '''
+    for item_type, (junction_table_name, id_column_name) in _ITEM_TABLES.items()
+}
+# Batch form of the above: $1 user_id, $2 group_name, $3 item ids (in the caller's order, no duplicates).
+# Items already in the group are dropped before numbering, and the "Group" row (locked FOR UPDATE) is bumped
+# past the last order actually inserted, so skipped items never consume order slots. ON CONFLICT only
+# fires for an item committed concurrently after the statement's snapshot.
+_ADD_ITEMS_TO_USER_GROUP_SQL = {
+    item_type: f'''
+        WITH grp AS (
+            SELECT group_id, next_item_order FROM "Group"
+            WHERE user_id = $1 AND group_name = $2
+            FOR UPDATE
+        ), new_ids AS (
+            SELECT ids.item_id, ids.ord
+            FROM unnest($3::integer[]) WITH ORDINALITY AS ids(item_id, ord), grp
+            WHERE NOT EXISTS (
+                SELECT 1 FROM {junction_table_name} t
+                WHERE t.group_id = grp.group_id AND t.{id_column_name} = ids.item_id
+            )
+        ), inserted AS (
+            INSERT INTO {junction_table_name} (group_id, {id_column_name}, item_order)
+            SELECT grp.group_id, n.item_id, grp.next_item_order + ROW_NUMBER() OVER (ORDER BY n.ord) - 1
+            FROM new_ids n, grp
+            ON CONFLICT DO NOTHING
+            RETURNING {id_column_name}, item_order
+        ), bumped AS (
+            UPDATE "Group" g
+            SET next_item_order = COALESCE((SELECT max(item_order) + 1 FROM inserted), grp.next_item_order)
+            FROM grp
+            WHERE g.group_id = grp.group_id
+        )
+        SELECT {id_column_name}, item_order FROM inserted ORDER BY item_order
+    '''
+    for item_type, (junction_table_name, id_column_name) in _ITEM_TABLES.items()
+}
+# Removes an item and reports whether the group exists: $1 user_id, $2 group_name, $3 item id.
+_REMOVE_ITEM_FROM_USER_GROUP_SQL = {
+    item_type: f'''
+        WITH grp AS (
+            SELECT group_id FROM "Group" WHERE user_id = $1 AND group_name = $2
+        ), removed AS (
+            DELETE FROM {junction_table_name} t
+            USING grp
+            WHERE t.group_id = grp.group_id AND t.{id_column_name} = $3
+            RETURNING t.{id_column_name}
+        )
+        SELECT EXISTS (SELECT 1 FROM grp), (SELECT count(*) FROM removed)
+    '''
+    for item_type, (junction_table_name, id_column_name) in _ITEM_TABLES.items()
+}
+# Swaps the items at orders $3 and $4 in the user's group: $1 user_id, $2 group_name.
+_SWITCH_ITEM_ORDER_SQL = {
+    item_type: f'''
+        WITH grp AS (
+            SELECT group_id FROM "Group" WHERE user_id = $1 AND group_name = $2
+        )
+        UPDATE {junction_table_name} t
+        SET item_order = CASE t.item_order WHEN $3::integer THEN $4::integer ELSE $3::integer END
+        FROM grp
+        WHERE t.group_id = grp.group_id
+          AND t.item_order IN ($3, $4)
+          AND EXISTS (SELECT 1 FROM {junction_table_name} WHERE group_id = grp.group_id AND item_order = $3)
+          AND EXISTS (SELECT 1 FROM {junction_table_name} WHERE group_id = grp.group_id AND item_order = $4)
+    '''
+    for item_type, (junction_table_name, _) in _ITEM_TABLES.items()
+}
+
+
+def _fetch_dicts(cursor, query: str, params: tuple):
     """
-    Adds a video to a specific group's video items with a given order.
-    Expects an active database cursor.
-    Returns True if successful, False otherwise.
+    Helper: Runs a query on a RealDictCursor opened on the same connection as `cursor`
+    (so it shares the caller's transaction) and returns the rows as dictionaries.
     """
-    success = False
-    try:
-        cursor.execute(
-            'INSERT INTO "Group_Video_Item" (group_id, video_id, item_order) VALUES (%s, %s, %s)',
-            (group_id, video_id, item_order)
-        )
-        success = True
-    except psycopg2.errors.UniqueViolation:
-        print(
-            f"TODO: Unique constraint violation: Video ID {video_id} might already be in group ID {group_id}, or order {item_order} is taken.")
-        success = False
-    except psycopg2.errors.ForeignKeyViolation:
-        print(f"TODO: Foreign key violation: Video ID {video_id} or Group ID {group_id} does not exist.")
-        success = False
-    except Exception as e:
-        print(f"TODO: Error adding video {video_id} to group {group_id}: {e}")
-        success = False
-    return success
-
-
-def add_playlist_to_group(cursor, group_id: int, playlist_id: int, item_order: int):
-    """
-    Adds a playlist to a specific group's playlist items with a given order.
-    Expects an active database cursor.
-    Returns True if successful, False otherwise.
+    with cursor.connection.cursor(cursor_factory=RealDictCursor) as dict_cur:
+        dict_cur.execute(query, params)
+        return dict_cur.fetchall()
+
+
+def _format_item_values(items: list):
     """
-    success = False
-    try:
-        cursor.execute(
-            'INSERT INTO "Group_Playlist_Item" (group_id, playlist_id, item_order) VALUES (%s, %s, %s)',
-            (group_id, playlist_id, item_order)
-        )
-        success = True
-    except psycopg2.errors.UniqueViolation:
-        print(
-            f"TODO: Unique constraint violation: Playlist ID {playlist_id} might already be in group ID {group_id}, or order {item_order} is taken.")
-        success = False
-    except psycopg2.errors.ForeignKeyViolation:
-        print(f"TODO: Foreign key violation: Playlist ID {playlist_id} or Group ID {group_id} does not exist.")
-        success = False
-    except Exception as e:
-        print(f"TODO: Error adding playlist {playlist_id} to group {group_id}: {e}")
-        success = False
-    return success
-
-
-def remove_video_from_group(cursor, group_id: int, video_id: int):
-    """
-    Removes a video from a specific group.
+    Helper: Renders the length and timestamp values of fetched item dicts in place, the way the API
+    has always serialized them (str(timedelta), datetime.isoformat()), so group items match the
+    strings get_accessible_videos returns for the same video. Returns `items`.
+    """
+    for item in items:
+        if "length" in item:
+            item["length"] = str(item["length"]) if item["length"] else None
+        for key in ("video_added_date", "added_to_group_at"):
+            if key in item:
+                item[key] = item[key].isoformat() if item[key] else None
+    return items
+
+
+def add_item_to_user_group(cursor, user_id: int, group_name: str, item_type: str, item_id: int):
+    """
+    Adds a video or playlist to the user's group, creating the group if needed.
+    The group is created with its column defaults, then a single statement reserves the item's order
+    by bumping next_item_order and inserts the item. An item already in the group leaves the group untouched.
+    Expects an active database cursor; database errors (e.g. ForeignKeyViolation, or UniqueViolation when a
+    concurrent request added the same item) propagate to the caller.
+    Returns the assigned item_order, or None if the item is already in the group.
+    """
+    DB.execute_prepared(cursor, "ensure_user_group", _ENSURE_USER_GROUP_SQL, (user_id, group_name))
+    DB.execute_prepared(cursor, f"add_{item_type}_to_user_group", _ADD_ITEM_TO_USER_GROUP_SQL[item_type],
+                        (user_id, group_name, item_id))
+    row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def add_items_to_user_group(cursor, user_id: int, group_name: str, item_type: str, item_ids: list):
+    """
+    Batch version of add_item_to_user_group: adds several videos or playlists to the user's group
+    in two statements. The group is created with its column defaults if needed, then one statement
+    inserts the items not yet in the group, numbered in the caller's order from next_item_order,
+    and bumps next_item_order by the number of rows inserted.
+    `item_ids` must not contain duplicates; items already in the group are skipped without using a slot.
+    Expects an active database cursor; database errors (e.g. ForeignKeyViolation) propagate to the caller.
+    Returns a list of (item_id, item_order) for the items actually added, in insertion order.
+    """
+    DB.execute_prepared(cursor, "ensure_user_group", _ENSURE_USER_GROUP_SQL, (user_id, group_name))
+    DB.execute_prepared(cursor, f"add_{item_type}s_to_user_group", _ADD_ITEMS_TO_USER_GROUP_SQL[item_type],
+                        (user_id, group_name, list(item_ids)))
+    return cursor.fetchall()
+
+
+def remove_items_from_group(cursor, group_id: int, item_type: str, item_ids: list):
+    """
+    Removes several videos or playlists from a specific group with one DELETE ... = ANY(...).
     Expects an active database cursor.
-    Returns the number of rows deleted (0 or 1).
+    Returns the number of rows deleted.
     """
     rows_deleted = 0
+    junction_table_name, id_column_name = _ITEM_TABLES[item_type]
     try:
         cursor.execute(
-            'DELETE FROM "Group_Video_Item" WHERE group_id = %s AND video_id = %s',
-            (group_id, video_id)
+            f'DELETE FROM {junction_table_name} WHERE group_id = %s AND {id_column_name} = ANY(%s)',
+            (group_id, list(item_ids))
         )
         rows_deleted = cursor.rowcount
-    except Exception as e:
-        print(f"TODO: Error removing video {video_id} from group {group_id}: {e}")
+    except Exception:
+        logger.exception("Error removing %s items %s from group %s", item_type, item_ids, group_id)
     return rows_deleted
 
 
-def remove_playlist_from_group(cursor, group_id: int, playlist_id: int):
+def remove_all_items_from_user_groups(cursor, user_id: int, item_type: str):
+    """
+    Removes every video or playlist from all of the user's groups with a single DELETE.
+    Expects an active database cursor; database errors propagate to the caller.
+    Returns a list of (group_id, group_name, item_id) for the removed items.
     """
-    Removes a playlist from a specific group.
+    junction_table_name, id_column_name = _ITEM_TABLES[item_type]
+    cursor.execute(
+        f'''
+        DELETE FROM {junction_table_name} t
+        USING "Group" g
+        WHERE t.group_id = g.group_id AND g.user_id = %s
+        RETURNING g.group_id, g.group_name, t.{id_column_name}
+        ''',
+        (user_id,)
+    )
+    return cursor.fetchall()
+
+
+def remove_item_from_user_group(cursor, user_id: int, group_name: str, item_type: str, item_id: int):
+    """
+    Removes a video or playlist from the user's group in one statement, resolving the group by
+    (user_id, group_name) inside it. The same statement also reports whether the group exists,
+    so callers can tell a missing group from a missing item without a follow-up lookup.
+    Expects an active database cursor; database errors propagate to the caller.
+    Returns a tuple: (group_found (bool), rows_deleted (int)).
+    """
+    DB.execute_prepared(cursor, f"remove_{item_type}_from_user_group", _REMOVE_ITEM_FROM_USER_GROUP_SQL[item_type],
+                        (user_id, group_name, item_id))
+    group_found, rows_deleted = cursor.fetchone()
+    return group_found, rows_deleted
+
+
+def _get_items_for_groups(cursor, query: str, group_ids: list):
+    """
+    Helper: Runs one of the per-group item queries for all `group_ids` at once and buckets the
+    formatted rows by group, keeping the query's item order. Groups without items are absent.
+    """
+    items_by_group = {}
+    for item in _format_item_values(_fetch_dicts(cursor, query, (list(group_ids),))):
+        items_by_group.setdefault(item.pop("group_id"), []).append(item)
+    return items_by_group
+
+
+def get_videos_for_groups(cursor, group_ids: list):
+    """
+    Retrieves the videos of several groups in one query, ordered by item_order within each group.
     Expects an active database cursor.
-    Returns the number of rows deleted (0 or 1).
+    Returns a dict: group_id -> list of video dictionaries ({} on error).
     """
-    rows_deleted = 0
     try:
-        cursor.execute(
-            'DELETE FROM "Group_Playlist_Item" WHERE group_id = %s AND playlist_id = %s',
-            (group_id, playlist_id)
-        )
-        rows_deleted = cursor.rowcount
-    except Exception as e:
-        print(f"TODO: Error removing playlist {playlist_id} from group {group_id}: {e}")
-    return rows_deleted
+        return _get_items_for_groups(cursor, _GROUP_VIDEOS_SQL, group_ids)
+    except Exception:
+        logger.exception("Error fetching videos for groups %s", group_ids)
+        return {}
+
+
+def get_playlists_for_groups(cursor, group_ids: list):
+    """
+    Retrieves the playlists of several groups in one query, ordered by item_order within each group.
+    Expects an active database cursor.
+    Returns a dict: group_id -> list of playlist dictionaries ({} on error).
+    """
+    try:
+        return _get_items_for_groups(cursor, _GROUP_PLAYLISTS_SQL, group_ids)
+    except Exception:
+        logger.exception("Error fetching playlists for groups %s", group_ids)
+        return {}
 
 
 def get_videos_for_group(cursor, group_id: int):
     """
     Retrieves all videos associated with a specific group_id, ordered by item_order.
-    Expects an active database cursor.
+    Expects an active database cursor; rows are read through a RealDictCursor on the same connection.
     Returns a list of video dictionaries.
     """
-    videos_list = []
-    try:
-        cursor.execute(
-            '''
-            SELECT v.video_id, v.name, v.youtube_id, v.description AS video_description, 
-                   v.length, v.upload_by, v.added_date AS video_added_date, 
-                   gvi.added_at AS added_to_group_at, gvi.item_order
-            FROM "Group_Video_Item" gvi
-            JOIN "Video" v ON gvi.video_id = v.video_id
-            WHERE gvi.group_id = %s
-            ORDER BY gvi.item_order ASC, gvi.added_at ASC
-            ''',
-            (group_id,)
-        )
-        video_items = cursor.fetchall()
-        for item in video_items:
-            videos_list.append({
-                "video_id": item[0],
-                "name": item[1],
-                "youtube_id": item[2],
-                "description": item[3],
-                "length": str(item[4]) if item[4] else None,
-                "upload_by": item[5],
-                "video_added_date": item[6].isoformat() if item[6] else None,
-                "added_to_group_at": item[7].isoformat() if item[7] else None,
-                "item_order": item[8]
-            })
-    except Exception as e:
-        print(f"TODO: Error fetching videos for group {group_id}: {e}")
-    return videos_list
+    return get_videos_for_groups(cursor, [group_id]).get(group_id, [])
 
 
 def get_playlists_for_group(cursor, group_id: int):
@@ -135,58 +285,27 @@ def get_playlists_for_group(cursor, group_id: int):
     Expects an active database cursor.
     Returns a list of playlist dictionaries.
     """
-    playlists_list = []
-    try:
-        cursor.execute(
-            '''
-            SELECT p.playlist_id, p.playlist_name, p.permission AS playlist_permission, 
-                   p.user_id AS playlist_owner_id, 
-                   gpi.added_at AS added_to_group_at, gpi.item_order
-            FROM "Group_Playlist_Item" gpi
-            JOIN "Playlist" p ON gpi.playlist_id = p.playlist_id
-            WHERE gpi.group_id = %s
-            ORDER BY gpi.item_order ASC, gpi.added_at ASC
-            ''',
-            (group_id,)
-        )
-        playlist_items = cursor.fetchall()
-        for item in playlist_items:
-            playlists_list.append({
-                "playlist_id": item[0],
-                "playlist_name": item[1],
-                "permission": item[2],
-                "playlist_owner_id": item[3],
-                "added_to_group_at": item[4].isoformat() if item[4] else None,
-                "item_order": item[5]
-            })
-    except Exception as e:
-        print(f"TODO: Error fetching playlists for group {group_id}: {e}")
-    return playlists_list
-
-
-def switch_item_order_in_group(cursor, group_id: int, item_type: str, order1: int, order2: int):
+    return get_playlists_for_groups(cursor, [group_id]).get(group_id, [])
+
+
+def switch_item_order_in_group(cursor, user_id: int, group_name: str, item_type: str, order1: int, order2: int):
     """
     Swaps the item_order of two items within the same group and of the same type.
-    Items are identified by their current order values.
+    The group is resolved by (user_id, group_name) inside the statement; items are identified by
+    their current order values. The swap is a single UPDATE with CASE, guarded so it only runs
+    when both positions are occupied.
     Expects an active database cursor.
-    Returns True if successful and two distinct items were found and swapped, False otherwise.
+    Returns True if successful and two items were found and swapped, False otherwise
+    (including when the group does not exist).
     """
     swapped_successfully = False
-    junction_table_name = ""
-    id_column_name = ""  # The actual ID column of the item (e.g., video_id, playlist_id)
-
-    if item_type == "video":
-        junction_table_name = '"Group_Video_Item"'
-        id_column_name = "video_id"
-    elif item_type == "playlist":
-        junction_table_name = '"Group_Playlist_Item"'
-        id_column_name = "playlist_id"
-    else:
-        print(f"TODO: Invalid item_type '{item_type}' for switching order.")
+
+    if item_type not in _ITEM_TABLES:
+        logger.warning("Invalid item_type '%s' for switching order.", item_type)
         return False
 
     if not isinstance(order1, int) or not isinstance(order2, int) or order1 <= 0 or order2 <= 0:
-        print(f"TODO: Invalid order numbers for switching: {order1}, {order2}.")
+        logger.warning("Invalid order numbers for switching: %s, %s.", order1, order2)
         return False
 
     if order1 == order2:
@@ -194,42 +313,16 @@ def switch_item_order_in_group(cursor, group_id: int, item_type: str, order1: in
         return True
 
     try:
-        # Find the primary IDs (video_id or playlist_id) of the items at the given order positions
-        sql_find_item1 = f'SELECT {id_column_name} FROM {junction_table_name} WHERE group_id = %s AND item_order = %s'
-        cursor.execute(sql_find_item1, (group_id, order1))
-        item1_row = cursor.fetchone()
-
-        sql_find_item2 = f'SELECT {id_column_name} FROM {junction_table_name} WHERE group_id = %s AND item_order = %s'
-        cursor.execute(sql_find_item2, (group_id, order2))
-        item2_row = cursor.fetchone()
-
-        if item1_row and item2_row:
-            item1_pk_id = item1_row[0]  # Actual ID of the video/playlist at order1
-            item2_pk_id = item2_row[0]  # Actual ID of the video/playlist at order2
-
-            if item1_pk_id == item2_pk_id:
-                print(
-                    f"TODO: Items at order {order1} and {order2} are the same item (ID: {item1_pk_id}). No swap needed.")
-                swapped_successfully = True
-            else:
-                # Perform the swap
-                # Update item1's order to order2
-                sql_update1 = f'UPDATE {junction_table_name} SET item_order = %s WHERE group_id = %s AND {id_column_name} = %s AND item_order = %s'
-                cursor.execute(sql_update1, (order2, group_id, item1_pk_id, order1))
-
-                # Update item2's order to order1
-                sql_update2 = f'UPDATE {junction_table_name} SET item_order = %s WHERE group_id = %s AND {id_column_name} = %s AND item_order = %s'
-                cursor.execute(sql_update2, (order1, group_id, item2_pk_id, order2))
-
-                # Assuming success if no exceptions were raised during the updates.
-                # For more robustness, you could check cursor.rowcount for each update.
-                swapped_successfully = True
+        DB.execute_prepared(cursor, f"switch_{item_type}_order", _SWITCH_ITEM_ORDER_SQL[item_type],
+                            (user_id, group_name, order1, order2))
+        if cursor.rowcount >= 2:
+            swapped_successfully = True
         else:
-            print(
-                f"TODO: One or both items not found at specified orders ({order1}, {order2}) in group {group_id} for type {item_type}.")
+            logger.info("One or both items not found at orders (%s, %s) in group '%s' for type %s.",
+                        order1, order2, group_name, item_type)
             # swapped_successfully remains False
 
-    except Exception as e:
-        print(f"TODO: Error switching item order in group {group_id} for type {item_type}: {e}")
+    except Exception:
+        logger.exception("Error switching item order in group '%s' for type %s", group_name, item_type)
         # swapped_successfully remains False
     return swapped_successfully
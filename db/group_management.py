@@ -1,9 +1,67 @@
+import logging
+import os
+import threading
+import time
 import psycopg2.errors
+from collections import OrderedDict
 from datetime import datetime
+from functools import wraps
 
 from db.DB import DB
 import db.group_item_management as gim  # For managing group items
-from db.video_management import get_accessible_videos
+from db.video_management import (get_accessible_playlist_ids, get_accessible_video_ids, get_accessible_videos,
+                                 get_accessible_videos_with_cursor, is_playlist_accessible, is_video_accessible)
+
+logger = logging.getLogger(__name__)
+
+# Hot statements below run as server-side prepared statements (DB.execute_prepared), hence $n placeholders.
+# Group listings use keyset pagination on group_name: $2 is the last name already seen (NULL for the
+# first page) and $3 the page size (NULL means no limit).
+# One page of a user's groups; their videos/playlists are then fetched for the whole page at once
+# (gim.get_videos_for_groups / get_playlists_for_groups), so a listing costs three round-trips, not 2N+1
+_GROUPS_PAGE_SQL = '''
+    SELECT g.group_id, g.group_name, g.description, g.created_at, g.updated_at, g.next_item_order
+    FROM "Group" g
+    WHERE g.user_id = $1 AND ($2::text IS NULL OR g.group_name > $2)
+    ORDER BY g.group_name
+    LIMIT $3
+'''
+_GROUP_SQL = '''
+    SELECT g.group_id, g.description, g.created_at, g.updated_at, g.next_item_order
+    FROM "Group" g
+    WHERE g.user_id = $1 AND g.group_name = $2
+'''
+_GROUP_DETAILS_SQL = 'SELECT group_id, next_item_order FROM "Group" WHERE user_id = $1 AND group_name = $2'
+_GROUP_NAMES_SQL = (
+    'SELECT group_id, group_name, description, created_at, updated_at, next_item_order '
+    'FROM "Group" WHERE user_id = $1 AND ($2::text IS NULL OR group_name > $2) ORDER BY group_name LIMIT $3'
+)
+_CREATE_GROUP_SQL = (
+    'INSERT INTO "Group" (user_id, group_name, description) VALUES ($1, $2, $3) '
+    'RETURNING group_id, created_at, updated_at, next_item_order'
+)
+_REMOVE_GROUP_SQL = 'DELETE FROM "Group" WHERE user_id = $1 AND group_name = $2'
+# One fixed UPDATE for every update_group call: $3 is the new name (NULL keeps it) and $4 says whether
+# $5 replaces the description, so a NULL description can still be set explicitly.
+_UPDATE_GROUP_SQL = '''
+    UPDATE "Group"
+    SET group_name = COALESCE($3::text, group_name),
+        description = CASE WHEN $4::boolean THEN $5::text ELSE description END,
+        updated_at = CURRENT_TIMESTAMP
+    WHERE user_id = $1 AND group_name = $2
+    RETURNING group_id, group_name, description, updated_at
+'''
+
+# Display labels for item_type in response messages
+_ITEM_LABELS = {"video": "Video", "playlist": "Playlist"}
+# Id key of each item_type in the group item JSON objects
+_ITEM_ID_KEYS = {"video": "video_id", "playlist": "playlist_id"}
+
+# Per-process LRU of accessible (video_ids, playlist_ids) per user, see _get_user_accessible_item_ids
+_ACCESSIBLE_IDS_TTL = float(os.getenv("ACCESSIBLE_IDS_CACHE_TTL", 3.0))
+_ACCESSIBLE_IDS_CACHE_SIZE = 1024
+_accessible_ids_cache = OrderedDict()  # user_id -> (computed_at, video_ids, playlist_ids)
+_accessible_ids_lock = threading.Lock()
 
 
 # --- Helper to get group_id and next_item_order ---
@@ -16,50 +74,179 @@ def _get_group_details(cursor, user_id: int, group_name: str):
     group_id_found = None
     next_order_val = None
     try:
-        cursor.execute(
-            'SELECT group_id, next_item_order FROM "Group" WHERE user_id = %s AND group_name = %s',
-            (user_id, group_name)
-        )
+        DB.execute_prepared(cursor, "group_details", _GROUP_DETAILS_SQL, (user_id, group_name))
         group_row = cursor.fetchone()
         if group_row:
             group_id_found = group_row[0]
             next_order_val = group_row[1]
-    except Exception as e:
-        print(f"TODO: Error in _get_group_details for user {user_id}, group {group_name}: {e}")
+    except Exception:
+        logger.exception("Error in _get_group_details for user %s, group %s", user_id, group_name)
     return group_id_found, next_order_val
 
 
-def _get_user_accessible_item_ids(user_id: int):
+def _iso_formatter():
+    """
+    Helper: Returns a per-request `iso(dt)` that renders a timestamp with isoformat() (None stays None),
+    memoised by value. Most groups are never updated, so created_at == updated_at and the second
+    lookup reuses the first string.
+    """
+    cache = {}
+
+    def iso(dt):
+        if dt is None:
+            return None
+        formatted = cache.get(dt)
+        if formatted is None:
+            formatted = cache[dt] = dt.isoformat()
+        return formatted
+
+    return iso
+
+
+def _get_user_accessible_item_ids(user_id: int, fresh_since: float = None, cursor=None):
+    """
+    Helper: Returns (accessible_video_ids (set), accessible_playlist_ids (set), success (bool)).
+    get_accessible_videos is the heaviest query on the group paths, so successful results are kept
+    in a small per-process LRU for ACCESSIBLE_IDS_CACHE_TTL seconds. Pass `fresh_since` (a
+    time.monotonic() value) to only accept a result computed at or after that moment.
+    On a miss the catalog is read on `cursor` when given (sharing the caller's connection),
+    otherwise on a connection of its own.
+    Cached sets may briefly miss newly accessible items: confirm negatives with _confirm_inaccessible.
+    """
+    now = time.monotonic()
+    oldest_accepted = now - _ACCESSIBLE_IDS_TTL if fresh_since is None else fresh_since
+    with _accessible_ids_lock:
+        cached = _accessible_ids_cache.get(user_id)
+        if cached and cached[0] >= oldest_accepted:
+            _accessible_ids_cache.move_to_end(user_id)
+            return cached[1], cached[2], True
+
     accessible_video_ids = set()
     accessible_playlist_ids = set()
-    accessible_content = get_accessible_videos(user_id) # from video_management
+    if cursor is not None:
+        accessible_content = get_accessible_videos_with_cursor(cursor, user_id)
+    else:
+        accessible_content = get_accessible_videos(user_id) # from video_management
+
+    if accessible_content.get("status") != "success":
+        return accessible_video_ids, accessible_playlist_ids, False
+    for pl_data in accessible_content.get("playlists", []):
+        accessible_playlist_ids.add(pl_data.get("playlist_id"))
+        for vid_item in pl_data.get("playlist_items", []):
+            accessible_video_ids.add(vid_item.get("video_id"))
 
-    if accessible_content.get("status") == "success":
-        for pl_data in accessible_content.get("playlists", []):
-            accessible_playlist_ids.add(pl_data.get("playlist_id"))
-            for vid_item in pl_data.get("playlist_items", []):
-                accessible_video_ids.add(vid_item.get("video_id"))
-    return accessible_video_ids, accessible_playlist_ids, accessible_content.get("status") == "success"
+    with _accessible_ids_lock:
+        _accessible_ids_cache[user_id] = (now, accessible_video_ids, accessible_playlist_ids)
+        _accessible_ids_cache.move_to_end(user_id)
+        while len(_accessible_ids_cache) > _ACCESSIBLE_IDS_CACHE_SIZE:
+            _accessible_ids_cache.popitem(last=False)
+    return accessible_video_ids, accessible_playlist_ids, True
 
 
-def _increment_group_next_item_order(cursor, group_id: int):
+def _confirm_inaccessible(user_id: int, item_type: str, item_ids: list, fresh_since: float, cursor=None):
     """
-    Helper: Increments the next_item_order for a given group_id.
-    Expects an active database cursor. Returns True if successful.
+    Helper: Re-checks ids that looked inaccessible against sets computed no earlier than `fresh_since`,
+    so a cached result never causes a 403 or a cleanup DELETE on its own.
+    Returns the ids that are really inaccessible, or None if accessibility could not be verified.
     """
-    success = False
-    try:
-        cursor.execute(
-            'UPDATE "Group" SET next_item_order = next_item_order + 1 WHERE group_id = %s',
-            (group_id,)
-        )
-        if cursor.rowcount == 1:
-            success = True
+    accessible_video_ids, accessible_playlist_ids, can_check_accessibility = \
+        _get_user_accessible_item_ids(user_id, fresh_since=fresh_since, cursor=cursor)
+    if not can_check_accessibility:
+        return None
+    accessible_ids = accessible_video_ids if item_type == "video" else accessible_playlist_ids
+    return [item_id for item_id in item_ids if item_id not in accessible_ids]
+
+
+def _drop_inaccessible_items(cursor, user_id: int, group_id: int, group_name: str, item_type: str,
+                             raw_items: list, accessible_ids: set, removed_items_report: list,
+                             fresh_since: float):
+    """
+    Helper: Returns the items of `raw_items` the user can still access. The rest (confirmed by
+    _confirm_inaccessible) are removed from the group with a single batched DELETE and appended
+    to `removed_items_report`.
+    """
+    id_key = _ITEM_ID_KEYS[item_type]
+    valid_items = []
+    suspect_ids = []
+    # One pass, one key lookup per item: every fetched item dict carries its id key
+    for item in raw_items:
+        item_id = item[id_key]
+        if item_id in accessible_ids:
+            valid_items.append(item)
         else:
-            print(f"TODO: Failed to increment next_item_order for group_id {group_id}, group might not exist.")
-    except Exception as e:
-        print(f"TODO: Error incrementing next_item_order for group {group_id}: {e}")
-    return success
+            suspect_ids.append(item_id)
+    if suspect_ids:
+        stale_ids = _confirm_inaccessible(user_id, item_type, suspect_ids, fresh_since, cursor=cursor)
+        if not stale_ids:
+            # Either all were accessible after all, or we could not verify: remove nothing
+            return raw_items
+        if len(stale_ids) < len(suspect_ids):
+            stale_id_set = set(stale_ids)
+            valid_items = [item for item in raw_items if item[id_key] not in stale_id_set]
+        gim.remove_items_from_group(cursor, group_id, item_type, stale_ids)
+        removed_items_report.extend(
+            {"group_id": group_id, "group_name": group_name, "item_type": item_type, "item_id": item_id,
+             "reason": "Not accessible or no longer exists"}
+            for item_id in stale_ids
+        )
+    return valid_items
+
+
+def _invalid_page_params(after_name, limit):
+    """
+    Helper: Validates keyset pagination parameters.
+    Returns an error reason (str) or None if they are usable.
+    """
+    if limit is not None and (not isinstance(limit, int) or limit <= 0):
+        return "limit must be a positive integer."
+    if after_name is not None and not isinstance(after_name, str):
+        return "after_name must be a string."
+    return None
+
+
+def _next_page_cursor(groups_list: list, limit):
+    """
+    Helper: Returns the keyset cursor (last group_name) for the next page,
+    or None when this page was not full and there is nothing more to fetch.
+    """
+    if limit is not None and len(groups_list) == limit:
+        return groups_list[-1]["group_name"]
+    return None
+
+
+def validate_group_payload(required: tuple):
+    """
+    Decorator: Runs the shared input checks of a group item endpoint once, before the wrapped function.
+    Checks that every field in `required` is present, that item_type is 'video' or 'playlist',
+    that user_id and any item_id/order1/order2 field are positive integers, and that an item_ids
+    field is a non-empty list of positive integers.
+    On failure returns ({"status": "failed", "reason": ...}, 400) without calling the function,
+    so the function body can trust `data` and `user_id`.
+    """
+    missing_reason = f"{', '.join(required[:-1])}, and {required[-1]} are required."
+    int_fields = tuple(field for field in required if field in ("item_id", "order1", "order2"))
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(data: dict, user_id: int):
+            if any(data.get(field) in (None, "") for field in required):
+                return {"status": "failed", "reason": missing_reason}, 400
+            if "item_type" in required and data["item_type"] not in ("video", "playlist"):
+                return {"status": "failed", "reason": "Invalid item_type. Must be 'video' or 'playlist'."}, 400
+            if not isinstance(user_id, int) or user_id <= 0:
+                return {"status": "failed", "reason": "Invalid user_id."}, 400
+            for field in int_fields:
+                value = data[field]
+                if not isinstance(value, int) or isinstance(value, bool) or value <= 0:
+                    return {"status": "failed", "reason": f"Invalid {field}. Must be a positive integer."}, 400
+            if "item_ids" in required:
+                item_ids = data["item_ids"]
+                if (not isinstance(item_ids, list) or not item_ids or
+                        any(not isinstance(i, int) or isinstance(i, bool) or i <= 0 for i in item_ids)):
+                    return {"status": "failed", "reason": "Invalid item_ids. Must be a non-empty list of positive integers."}, 400
+            return func(data, user_id)
+        return wrapper
+    return decorator
 
 
 # --- Group Management Functions ---
@@ -86,10 +273,7 @@ def create_group(data: dict, user_id: int):
         try:
             with DB.get_cursor() as cur:
                 # next_item_order defaults to 1 due to table DDL
-                cur.execute(
-                    'INSERT INTO "Group" (user_id, group_name, description) VALUES (%s, %s, %s) RETURNING group_id, created_at, updated_at, next_item_order',
-                    (user_id, group_name, description)
-                )
+                DB.execute_prepared(cur, "create_group", _CREATE_GROUP_SQL, (user_id, group_name, description))
                 new_group = cur.fetchone()
                 if new_group:
                     response_dict = {
@@ -110,7 +294,7 @@ def create_group(data: dict, user_id: int):
                              "reason": f"A group named '{group_name}' already exists for this user."}
             http_status_code = 409
         except Exception as e:
-            print(f"TODO: Error in create_group: {e}")
+            logger.exception("Error in create_group")
             response_dict["reason"] = f"An unexpected error occurred: {str(e)}"
 
     return response_dict, http_status_code
@@ -142,108 +326,103 @@ def update_group(data: dict, user_id: int):
     else:
         try:
             with DB.get_cursor() as cur:
-                group_id_to_update, _ = _get_group_details(cur, user_id, old_group_name)
-
-                if not group_id_to_update:
-                    response_dict = {"status": "failed", "reason": f"Group '{old_group_name}' not found for this user."}
-                    http_status_code = 404
-                else:
-                    fields_to_update_sql = []
-                    params_for_sql = []
-
-                    if new_group_name is not None and new_group_name != old_group_name:
-                        cur.execute(
-                            'SELECT group_id FROM "Group" WHERE user_id = %s AND group_name = %s AND group_id != %s',
-                            (user_id, new_group_name, group_id_to_update)
-                        )
-                        if cur.fetchone():
-                            response_dict = {"status": "failed",
-                                             "reason": f"A group named '{new_group_name}' already exists for this user."}
-                            http_status_code = 409
-                            raise psycopg2.errors.UniqueViolation("Simulated: New group name conflict")
+                rename_to = None
+                description_set = "new_description" in data
 
-                        fields_to_update_sql.append("group_name = %s")
-                        params_for_sql.append(new_group_name)
+                if new_group_name is not None and new_group_name != old_group_name:
+                    # A taken name is reported by the (user_id, group_name) UNIQUE constraint, no pre-check needed
+                    rename_to = new_group_name
 
-                    if "new_description" in data:
-                        fields_to_update_sql.append("description = %s")
-                        params_for_sql.append(new_description)
-
-                    if not fields_to_update_sql:
+                if rename_to is None and not description_set:
+                    # Nothing to write; only confirm the group exists
+                    group_id_found, _ = _get_group_details(cur, user_id, old_group_name)
+                    if group_id_found:
                         response_dict = {"status": "success", "message": "No changes applied to the group."}
                         http_status_code = 200
                     else:
-                        fields_to_update_sql.append("updated_at = CURRENT_TIMESTAMP")
-                        params_for_sql.append(group_id_to_update)
-
-                        update_query = f'UPDATE "Group" SET {", ".join(fields_to_update_sql)} WHERE group_id = %s RETURNING group_name, description, updated_at'
-                        cur.execute(update_query, tuple(params_for_sql))
-                        updated_group = cur.fetchone()
-
-                        if updated_group:
-                            response_dict = {
-                                "status": "success",
-                                "message": "Group updated successfully.",
-                                "group_id": group_id_to_update,
-                                "group_name": updated_group[0],
-                                "description": updated_group[1],
-                                "updated_at": updated_group[2].isoformat() if updated_group[2] else None
-                            }
-                            http_status_code = 200
-                        else:
-                            response_dict["reason"] = "Failed to retrieve group details after update."
-
-        except psycopg2.errors.UniqueViolation as e:
-            if "Simulated: New group name conflict" not in str(e):
-                response_dict = {"status": "failed", "reason": f"A group with the new name might already exist."}
-                http_status_code = 409
-            # If it IS the simulated one, response_dict and http_status_code are already set
+                        response_dict = {"status": "failed", "reason": f"Group '{old_group_name}' not found for this user."}
+                        http_status_code = 404
+                else:
+                    # The group is resolved by (user_id, group_name) in the UPDATE itself; no prior lookup
+                    DB.execute_prepared(cur, "update_group", _UPDATE_GROUP_SQL,
+                                        (user_id, old_group_name, rename_to, description_set, new_description))
+                    updated_group = cur.fetchone()
+
+                    if updated_group:
+                        response_dict = {
+                            "status": "success",
+                            "message": "Group updated successfully.",
+                            "group_id": updated_group[0],
+                            "group_name": updated_group[1],
+                            "description": updated_group[2],
+                            "updated_at": updated_group[3].isoformat() if updated_group[3] else None
+                        }
+                        http_status_code = 200
+                    else:
+                        response_dict = {"status": "failed", "reason": f"Group '{old_group_name}' not found for this user."}
+                        http_status_code = 404
+
+        except psycopg2.errors.UniqueViolation:
+            response_dict = {"status": "failed",
+                             "reason": f"A group named '{new_group_name}' already exists for this user."}
+            http_status_code = 409
         except Exception as e:
-            print(f"TODO: Error in update_group: {e}")
+            logger.exception("Error in update_group")
             response_dict["reason"] = f"An unexpected error occurred: {str(e)}"
 
     return response_dict, http_status_code
 
 
-def get_group_names(user_id: int):
+def get_group_names(user_id: int, after_name: str = None, limit: int = None):
     """
-    Retrieves all group names, descriptions, and timestamps for a given user.
+    Retrieves group names, descriptions, and timestamps for a given user, ordered by group_name.
+    Optional keyset pagination: pass `limit` for a page size and the previous page's
+    `next_cursor` as `after_name`. Without `limit` all groups are returned.
     Returns a tuple: (response_dict, http_status_code)
     """
     response_dict = {"status": "failed", "reason": "Failed to retrieve groups."}
     http_status_code = 500
-    groups_list = []
+    page_error = _invalid_page_params(after_name, limit)
 
     if not isinstance(user_id, int) or user_id <= 0:
         response_dict = {"status": "failed", "reason": "Invalid user_id."}
         http_status_code = 400
+    elif page_error:
+        response_dict = {"status": "failed", "reason": page_error}
+        http_status_code = 400
     else:
         try:
             with DB.get_cursor() as cur:
-                cur.execute(
-                    'SELECT group_id, group_name, description, created_at, updated_at, next_item_order FROM "Group" WHERE user_id = %s ORDER BY group_name',
-                    (user_id,)
-                )
-                rows = cur.fetchall()
-                for row in rows:
-                    groups_list.append({
-                        "group_id": row[0],
-                        "group_name": row[1],
-                        "description": row[2],
-                        "created_at": row[3].isoformat() if row[3] else None,
-                        "updated_at": row[4].isoformat() if row[4] else None,
-                        "next_item_order": row[5]
-                    })
+                DB.execute_prepared(cur, "group_names", _GROUP_NAMES_SQL, (user_id, after_name, limit))
+                iso = _iso_formatter()
+                groups_list = [
+                    {
+                        "group_id": group_id,
+                        "group_name": group_name,
+                        "description": description,
+                        "created_at": iso(created_at),
+                        "updated_at": iso(updated_at),
+                        "next_item_order": next_item_order
+                    }
+                    for group_id, group_name, description, created_at, updated_at, next_item_order in cur.fetchall()
+                ]
                 response_dict = {"status": "success", "groups": groups_list}
+                if limit is not None:
+                    response_dict["next_cursor"] = _next_page_cursor(groups_list, limit)
                 http_status_code = 200
         except Exception as e:
-            print(f"TODO: Error in get_group_names: {e}")
+            logger.exception("Error in get_group_names")
             response_dict["reason"] = f"An unexpected error occurred: {str(e)}"
 
     return response_dict, http_status_code
 
 
-def get_groups(user_id: int):
+def get_groups(user_id: int, after_name: str = None, limit: int = None):
+    """
+    Retrieves a user's groups with their items, removing items the user can no longer access.
+    Supports the same optional keyset pagination as get_group_names (`after_name`, `limit`).
+    Returns a tuple: (response_dict, http_status_code)
+    """
     response_dict = {"status": "failed", "reason": "Failed to retrieve groups and items."}
     http_status_code = 500
     final_groups_data = []
@@ -253,62 +432,59 @@ def get_groups(user_id: int):
         response_dict = {"status": "failed", "reason": "Invalid user_id."}
         http_status_code = 400
         return response_dict, http_status_code
+    page_error = _invalid_page_params(after_name, limit)
+    if page_error:
+        response_dict = {"status": "failed", "reason": page_error}
+        http_status_code = 400
+        return response_dict, http_status_code
 
     try:
-        accessible_video_ids, accessible_playlist_ids, can_check_accessibility = _get_user_accessible_item_ids(user_id)
-        if not can_check_accessibility:
-            response_dict = {"status": "failed", "reason": "Could not verify item accessibility for cleanup."}
-            http_status_code = 500
-            return response_dict, http_status_code
-
+        request_started = time.monotonic()
+        # Accessibility reads, cleanup DELETEs and the listing share one connection/transaction
         with DB.get_cursor() as cur:
-            cur.execute(
-                'SELECT group_id, group_name, description, created_at, updated_at, next_item_order FROM "Group" WHERE user_id = %s ORDER BY group_name',
-                (user_id,)
-            )
-            groups = cur.fetchall()
-
-            for group_row in groups:
-                group_id, group_name, description, created_at, updated_at, next_item_order = group_row
-
-                # Get raw items from group
-                raw_videos_in_group = gim.get_videos_for_group(cur, group_id)
-                raw_playlists_in_group = gim.get_playlists_for_group(cur, group_id)
+            accessible_video_ids, accessible_playlist_ids, can_check_accessibility = \
+                _get_user_accessible_item_ids(user_id, cursor=cur)
+            if not can_check_accessibility:
+                response_dict = {"status": "failed", "reason": "Could not verify item accessibility for cleanup."}
+                http_status_code = 500
+                return response_dict, http_status_code
+
+            if not accessible_video_ids and not accessible_playlist_ids:
+                # Fast path: nothing is accessible (re-checked uncached), so every group item is stale.
+                # Two blanket DELETEs replace per-group cleanup; the listing below then sees empty groups.
+                accessible_video_ids, accessible_playlist_ids, _ = \
+                    _get_user_accessible_item_ids(user_id, fresh_since=request_started, cursor=cur)
+                if not accessible_video_ids and not accessible_playlist_ids:
+                    for item_type in ("video", "playlist"):
+                        removed_items_report.extend(
+                            {"group_id": group_id, "group_name": group_name, "item_type": item_type,
+                             "item_id": item_id, "reason": "Not accessible or no longer exists"}
+                            for group_id, group_name, item_id in gim.remove_all_items_from_user_groups(cur, user_id, item_type)
+                        )
 
-                # Filter and collect items to remove
-                valid_videos_in_group = []
-                for video_item in raw_videos_in_group:
-                    if video_item.get("video_id") in accessible_video_ids:
-                        valid_videos_in_group.append(video_item)
-                    else:
-                        # Item is in group but not accessible or doesn't exist, remove it
-                        gim.remove_video_from_group(cur, group_id, video_item.get("video_id"))
-                        removed_items_report.append({
-                            "group_id": group_id, "group_name": group_name,
-                            "item_type": "video", "item_id": video_item.get("video_id"),
-                            "reason": "Not accessible or no longer exists"
-                        })
-
-                valid_playlists_in_group = []
-                for playlist_item in raw_playlists_in_group:
-                    if playlist_item.get("playlist_id") in accessible_playlist_ids:
-                        valid_playlists_in_group.append(playlist_item)
-                    else:
-                        gim.remove_playlist_from_group(cur, group_id, playlist_item.get("playlist_id"))
-                        removed_items_report.append({
-                            "group_id": group_id, "group_name": group_name,
-                            "item_type": "playlist", "item_id": playlist_item.get("playlist_id"),
-                            "reason": "Not accessible or no longer exists"
-                        })
-                        # Note: If a playlist is removed, its next_item_order in the group might need re-evaluation
-                        # if we were compacting orders, but current gim.remove_... doesn't do that.
+            DB.execute_prepared(cur, "groups_page", _GROUPS_PAGE_SQL, (user_id, after_name, limit))
+            group_rows = cur.fetchall()
+            group_ids = [group_row[0] for group_row in group_rows]
+            iso = _iso_formatter()
+            videos_by_group = gim.get_videos_for_groups(cur, group_ids) if group_ids else {}
+            playlists_by_group = gim.get_playlists_for_groups(cur, group_ids) if group_ids else {}
+
+            for group_id, group_name, description, created_at, updated_at, next_item_order in group_rows:
+                # Items in the group that are not accessible or no longer exist are removed
+                # Note: removals leave gaps in item_order; orders are not compacted.
+                valid_videos_in_group = _drop_inaccessible_items(
+                    cur, user_id, group_id, group_name, "video", videos_by_group.get(group_id, []),
+                    accessible_video_ids, removed_items_report, request_started)
+                valid_playlists_in_group = _drop_inaccessible_items(
+                    cur, user_id, group_id, group_name, "playlist", playlists_by_group.get(group_id, []),
+                    accessible_playlist_ids, removed_items_report, request_started)
 
                 group_data = {
                     "group_id": group_id,
                     "group_name": group_name,
                     "description": description,
-                    "created_at": created_at.isoformat() if created_at else None,
-                    "updated_at": updated_at.isoformat() if updated_at else None,
+                    "created_at": iso(created_at),
+                    "updated_at": iso(updated_at),
                     "next_item_order": next_item_order,
                     "videos": valid_videos_in_group,
                     "playlists": valid_playlists_in_group
@@ -316,12 +492,14 @@ def get_groups(user_id: int):
                 final_groups_data.append(group_data)
 
             response_dict = {"status": "success", "groups": final_groups_data}
+            if limit is not None:
+                response_dict["next_cursor"] = _next_page_cursor(final_groups_data, limit)
             if removed_items_report:
                 response_dict["removed_items_info"] = removed_items_report
             http_status_code = 200
 
     except Exception as e:
-        print(f"Error in get_groups: {e}")
+        logger.exception("Error in get_groups")
         response_dict["reason"] = f"An unexpected error occurred: {str(e)}"
         http_status_code = 500
 
@@ -343,17 +521,16 @@ def get_group(user_id: int, group_name: str):
         return response_dict, http_status_code
 
     try:
-        accessible_video_ids, accessible_playlist_ids, can_check_accessibility = _get_user_accessible_item_ids(user_id)
-        if not can_check_accessibility:
-            response_dict = {"status": "failed", "reason": "Could not verify item accessibility for cleanup."}
-            http_status_code = 500
-            return response_dict, http_status_code
-
+        request_started = time.monotonic()
         with DB.get_cursor() as cur:
-            cur.execute(
-                'SELECT group_id, description, created_at, updated_at, next_item_order FROM "Group" WHERE user_id = %s AND group_name = %s',
-                (user_id, group_name)
-            )
+            accessible_video_ids, accessible_playlist_ids, can_check_accessibility = \
+                _get_user_accessible_item_ids(user_id, cursor=cur)
+            if not can_check_accessibility:
+                response_dict = {"status": "failed", "reason": "Could not verify item accessibility for cleanup."}
+                http_status_code = 500
+                return response_dict, http_status_code
+
+            DB.execute_prepared(cur, "get_group", _GROUP_SQL, (user_id, group_name))
             group_info = cur.fetchone()
 
             if not group_info:
@@ -361,40 +538,23 @@ def get_group(user_id: int, group_name: str):
                 http_status_code = 404
             else:
                 group_id, description, created_at, updated_at, next_item_order = group_info
-
+                iso = _iso_formatter()
                 raw_videos_in_group = gim.get_videos_for_group(cur, group_id)
                 raw_playlists_in_group = gim.get_playlists_for_group(cur, group_id)
 
-                valid_videos_in_group = []
-                for video_item in raw_videos_in_group:
-                    if video_item.get("video_id") in accessible_video_ids:
-                        valid_videos_in_group.append(video_item)
-                    else:
-                        gim.remove_video_from_group(cur, group_id, video_item.get("video_id"))
-                        removed_items_report.append({
-                            "group_id": group_id, "group_name": group_name,
-                            "item_type": "video", "item_id": video_item.get("video_id"),
-                            "reason": "Not accessible or no longer exists"
-                        })
-
-                valid_playlists_in_group = []
-                for playlist_item in raw_playlists_in_group:
-                    if playlist_item.get("playlist_id") in accessible_playlist_ids:
-                        valid_playlists_in_group.append(playlist_item)
-                    else:
-                        gim.remove_playlist_from_group(cur, group_id, playlist_item.get("playlist_id"))
-                        removed_items_report.append({
-                            "group_id": group_id, "group_name": group_name,
-                            "item_type": "playlist", "item_id": playlist_item.get("playlist_id"),
-                            "reason": "Not accessible or no longer exists"
-                        })
+                valid_videos_in_group = _drop_inaccessible_items(
+                    cur, user_id, group_id, group_name, "video", raw_videos_in_group,
+                    accessible_video_ids, removed_items_report, request_started)
+                valid_playlists_in_group = _drop_inaccessible_items(
+                    cur, user_id, group_id, group_name, "playlist", raw_playlists_in_group,
+                    accessible_playlist_ids, removed_items_report, request_started)
 
                 group_data_to_return = {
                     "group_id": group_id,
                     "group_name": group_name,
                     "description": description,
-                    "created_at": created_at.isoformat() if created_at else None,
-                    "updated_at": updated_at.isoformat() if updated_at else None,
+                    "created_at": iso(created_at),
+                    "updated_at": iso(updated_at),
                     "next_item_order": next_item_order,
                     "videos": valid_videos_in_group,
                     "playlists": valid_playlists_in_group
@@ -404,104 +564,45 @@ def get_group(user_id: int, group_name: str):
                     response_dict["removed_items_info"] = removed_items_report
                 http_status_code = 200
     except Exception as e:
-        print(f"Error in get_group: {e}")
+        logger.exception("Error in get_group")
         response_dict["reason"] = f"An unexpected error occurred: {str(e)}"
         http_status_code = 500
 
     return response_dict, http_status_code
 
 
+@validate_group_payload(required=("group_name", "item_type", "item_id"))
 def insert_group_item(data: dict, user_id: int):
     response_dict = {"status": "failed", "reason": "Failed to add item to group."}
     http_status_code = 500
 
-    group_name = data.get("group_name")
-    item_type = data.get("item_type")
-    item_id = data.get("item_id") # This is video_id or playlist_id
-
-    if not group_name or not item_type or item_id is None:
-        response_dict = {"status": "failed", "reason": "group_name, item_type, and item_id are required."}
-        http_status_code = 400
-        return response_dict, http_status_code
-    if item_type not in ["video", "playlist"]:
-        response_dict = {"status": "failed", "reason": "Invalid item_type. Must be 'video' or 'playlist'."}
-        http_status_code = 400
-        return response_dict, http_status_code
-    if not isinstance(user_id, int) or user_id <= 0: # Should be caught by auth, but good to have
-        response_dict = {"status": "failed", "reason": "Invalid user_id."}
-        http_status_code = 400
-        return response_dict, http_status_code
-    if not isinstance(item_id, int) or item_id <= 0:
-        response_dict = {"status": "failed", "reason": "Invalid item_id."}
-        http_status_code = 400
-        return response_dict, http_status_code
+    # Already validated by @validate_group_payload
+    group_name = data["group_name"]
+    item_type = data["item_type"]
+    item_id = data["item_id"] # This is video_id or playlist_id
 
     try:
-        # Get all items accessible by the user
-        # NOTE: get_accessible_videos might make its own DB call.
-        # If insert_group_item is already within a DB.get_cursor() context,
-        # you might need to adjust how get_accessible_videos is called or
-        # fetch this information outside the main transaction if it's too complex.
-        # For this example, assuming get_accessible_videos can be called here.
-        accessible_content = get_accessible_videos(user_id)  # from video_management
-        if accessible_content.get("status") != "success":
-            response_dict = {"status": "failed", "reason": "Could not verify item accessibility."}
-            http_status_code = 500
-            return response_dict, http_status_code
-
-        is_accessible = False
-        if item_type == "video":
-            for pl in accessible_content.get("playlists", []):
-                for vid_item in pl.get("playlist_items", []):
-                    if vid_item.get("video_id") == item_id:
-                        is_accessible = True
-                        break
-                if is_accessible:
-                    break
-        elif item_type == "playlist":
-            for pl in accessible_content.get("playlists", []):
-                if pl.get("playlist_id") == item_id:
-                    is_accessible = True
-                    break
-
-        if not is_accessible:
-            response_dict = {"status": "failed", "reason": f"{item_type.capitalize()} ID {item_id} is not accessible to the user."}
-            http_status_code = 403 # Forbidden
-            return response_dict, http_status_code
-
-        # Proceed with insertion if accessible
         with DB.get_cursor() as cur:
-            group_id_to_use, assigned_order = _get_group_details(cur, user_id, group_name)
-            item_added_successfully = False
-
-            if not group_id_to_use:
-                cur.execute(
-                    'INSERT INTO "Group" (user_id, group_name) VALUES (%s, %s) RETURNING group_id, next_item_order',
-                    (user_id, group_name)
-                )
-                group_id_row = cur.fetchone()
-                if not group_id_row:
-                    raise Exception("Critical: Failed to create group during item insertion.")
-                group_id_to_use = group_id_row[0]
-                assigned_order = group_id_row[1]
-
+            # One-row EXISTS check instead of loading the user's whole accessible catalog
             if item_type == "video":
-                item_added_successfully = gim.add_video_to_group(cur, group_id_to_use, item_id, assigned_order)
-            elif item_type == "playlist":
-                item_added_successfully = gim.add_playlist_to_group(cur, group_id_to_use, item_id, assigned_order)
+                is_accessible = is_video_accessible(cur, user_id, item_id)
+            else:
+                is_accessible = is_playlist_accessible(cur, user_id, item_id)
 
-            if item_added_successfully:
-                if _increment_group_next_item_order(cur, group_id_to_use):
-                    response_dict = {
-                        "status": "success",
-                        "message": f"{item_type.capitalize()} with ID {item_id} added to group '{group_name}' at order {assigned_order}."
-                    }
-                    http_status_code = 201
-                else:
-                    # This case should ideally lead to a rollback by the context manager
-                    response_dict = {"status": "failed", "reason": "Item added but failed to update group order."}
-                    http_status_code = 500
-                    raise Exception("Failed to increment group order after item insertion.") # Ensures rollback
+            if not is_accessible:
+                response_dict = {"status": "failed", "reason": f"{_ITEM_LABELS[item_type]} ID {item_id} is not accessible to the user."}
+                http_status_code = 403 # Forbidden
+                return response_dict, http_status_code
+
+            # Proceed with insertion if accessible: group creation, then order reservation and item insert in one statement
+            assigned_order = gim.add_item_to_user_group(cur, user_id, group_name, item_type, item_id)
+
+            if assigned_order is not None:
+                response_dict = {
+                    "status": "success",
+                    "message": f"{_ITEM_LABELS[item_type]} with ID {item_id} added to group '{group_name}' at order {assigned_order}."
+                }
+                http_status_code = 201
             else:
                 response_dict = {"status": "failed", "reason": f"Failed to add {item_type} ID {item_id} to group. It might already exist in the group with this order, or the item ID is invalid."}
                 http_status_code = 409
@@ -513,13 +614,64 @@ def insert_group_item(data: dict, user_id: int):
         response_dict = {"status": "failed", "reason": f"The specified {item_type} ID {item_id} does not exist in its respective table."}
         http_status_code = 404 # Not Found for the item itself
     except Exception as e:
-        print(f"Error in insert_group_item: {e}")
+        logger.exception("Error in insert_group_item")
         response_dict["reason"] = f"An unexpected error occurred: {str(e)}"
         http_status_code = 500 # Ensure status code is 500 for general exceptions
 
     return response_dict, http_status_code
 
 
+@validate_group_payload(required=("group_name", "item_type", "item_ids"))
+def insert_group_items(data: dict, user_id: int):
+    """
+    Adds several items of one type to a user's group (created if it doesn't exist) in one batch.
+    Expects data: {"group_name": <string>, "item_type": <"video" or "playlist">, "item_ids": [<int>, ...]}
+    Inaccessible items and items already in the group are skipped and reported.
+    Returns a tuple: (response_dict, http_status_code)
+    """
+    response_dict = {"status": "failed", "reason": "Failed to add items to group."}
+    http_status_code = 500
+
+    # Already validated by @validate_group_payload
+    group_name = data["group_name"]
+    item_type = data["item_type"]
+    item_ids = list(dict.fromkeys(data["item_ids"]))  # De-duplicate, keeping the caller's order
+
+    try:
+        with DB.get_cursor() as cur:
+            # Only the requested ids are checked (one = ANY query), not the user's whole catalog
+            if item_type == "video":
+                accessible_ids = get_accessible_video_ids(cur, user_id, item_ids)
+            else:
+                accessible_ids = get_accessible_playlist_ids(cur, user_id, item_ids)
+            inaccessible_ids = [item_id for item_id in item_ids if item_id not in accessible_ids]
+            if inaccessible_ids:
+                response_dict = {"status": "failed",
+                                 "reason": f"{_ITEM_LABELS[item_type]} IDs {inaccessible_ids} are not accessible to the user."}
+                http_status_code = 403
+                return response_dict, http_status_code
+
+            added = gim.add_items_to_user_group(cur, user_id, group_name, item_type, item_ids)
+
+        added_ids = {item_id for item_id, _ in added}
+        response_dict = {
+            "status": "success",
+            "added": [{"item_id": item_id, "item_order": item_order} for item_id, item_order in added],
+            "already_in_group": [item_id for item_id in item_ids if item_id not in added_ids]
+        }
+        http_status_code = 201 if added else 200
+
+    except psycopg2.errors.ForeignKeyViolation:
+        response_dict = {"status": "failed", "reason": f"One of the specified {item_type} IDs does not exist in its respective table."}
+        http_status_code = 404
+    except Exception as e:
+        logger.exception("Error in insert_group_items")
+        response_dict["reason"] = f"An unexpected error occurred: {str(e)}"
+
+    return response_dict, http_status_code
+
+
+@validate_group_payload(required=("group_name", "item_type", "item_id"))
 def remove_group_item(data: dict, user_id: int):
     """
     Removes an item (video or playlist) from a user's group.
@@ -529,48 +681,29 @@ def remove_group_item(data: dict, user_id: int):
     response_dict = {"status": "failed", "reason": "Failed to remove item from group."}
     http_status_code = 500
 
-    group_name = data.get("group_name")
-    item_type = data.get("item_type")
-    item_id = data.get("item_id")
+    # Already validated by @validate_group_payload
+    group_name = data["group_name"]
+    item_type = data["item_type"]
+    item_id = data["item_id"]
 
-    if not group_name or not item_type or item_id is None:
-        response_dict = {"status": "failed", "reason": "group_name, item_type, and item_id are required."}
-        http_status_code = 400
-    elif item_type not in ["video", "playlist"]:
-        response_dict = {"status": "failed", "reason": "Invalid item_type. Must be 'video' or 'playlist'."}
-        http_status_code = 400
-    elif not isinstance(user_id, int) or user_id <= 0:
-        response_dict = {"status": "failed", "reason": "Invalid user_id."}
-        http_status_code = 400
-    elif not isinstance(item_id, int) or item_id <= 0:
-        response_dict = {"status": "failed", "reason": "Invalid item_id."}
-        http_status_code = 400
-    else:
-        try:
-            with DB.get_cursor() as cur:
-                group_id_to_use, _ = _get_group_details(cur, user_id, group_name)
-                rows_affected = 0
+    try:
+        with DB.get_cursor() as cur:
+            group_found, rows_affected = gim.remove_item_from_user_group(cur, user_id, group_name, item_type, item_id)
 
-                if not group_id_to_use:
-                    response_dict = {"status": "failed", "reason": f"Group '{group_name}' not found for this user."}
-                    http_status_code = 404
-                else:
-                    if item_type == "video":
-                        rows_affected = gim.remove_video_from_group(cur, group_id_to_use, item_id)
-                    elif item_type == "playlist":
-                        rows_affected = gim.remove_playlist_from_group(cur, group_id_to_use, item_id)
-
-                    if rows_affected > 0:
-                        response_dict = {"status": "success",
-                                         "message": f"{item_type.capitalize()} with ID {item_id} removed from group '{group_name}'."}
-                        http_status_code = 200
-                    else:
-                        response_dict = {"status": "failed",
-                                         "reason": f"{item_type.capitalize()} with ID {item_id} not found in group '{group_name}'."}
-                        http_status_code = 404
-        except Exception as e:
-            print(f"TODO: Error in remove_group_item: {e}")
-            response_dict["reason"] = f"An unexpected error occurred: {str(e)}"
+            if rows_affected > 0:
+                response_dict = {"status": "success",
+                                 "message": f"{_ITEM_LABELS[item_type]} with ID {item_id} removed from group '{group_name}'."}
+                http_status_code = 200
+            elif not group_found:
+                response_dict = {"status": "failed", "reason": f"Group '{group_name}' not found for this user."}
+                http_status_code = 404
+            else:
+                response_dict = {"status": "failed",
+                                 "reason": f"{_ITEM_LABELS[item_type]} with ID {item_id} not found in group '{group_name}'."}
+                http_status_code = 404
+    except Exception as e:
+        logger.exception("Error in remove_group_item")
+        response_dict["reason"] = f"An unexpected error occurred: {str(e)}"
 
     return response_dict, http_status_code
 
@@ -596,10 +729,7 @@ def remove_group(data: dict, user_id: int):
     else:
         try:
             with DB.get_cursor() as cur:
-                cur.execute(
-                    'DELETE FROM "Group" WHERE user_id = %s AND group_name = %s',
-                    (user_id, group_name)
-                )
+                DB.execute_prepared(cur, "remove_group", _REMOVE_GROUP_SQL, (user_id, group_name))
                 if cur.rowcount > 0:
                     response_dict = {"status": "success",
                                      "message": f"Group '{group_name}' and all its items removed successfully."}
@@ -608,12 +738,13 @@ def remove_group(data: dict, user_id: int):
                     response_dict = {"status": "failed", "reason": f"Group '{group_name}' not found for this user."}
                     http_status_code = 404
         except Exception as e:
-            print(f"TODO: Error in remove_group: {e}")
+            logger.exception("Error in remove_group")
             response_dict["reason"] = f"An unexpected error occurred: {str(e)}"
 
     return response_dict, http_status_code
 
 
+@validate_group_payload(required=("group_name", "item_type", "order1", "order2"))
 def switch_group_item_placement(data: dict, user_id: int):
     """
     Switches the placement (item_order) of two items within a user's group.
@@ -628,48 +759,33 @@ def switch_group_item_placement(data: dict, user_id: int):
     response_dict = {"status": "failed", "reason": "Failed to switch item placement."}
     http_status_code = 500
 
-    group_name = data.get("group_name")
-    item_type = data.get("item_type")
-    order1 = data.get("order1")
-    order2 = data.get("order2")
+    # Already validated by @validate_group_payload
+    group_name = data["group_name"]
+    item_type = data["item_type"]
+    order1 = data["order1"]
+    order2 = data["order2"]
 
-    if not all([group_name, item_type, isinstance(order1, int), isinstance(order2, int)]):
-        response_dict = {"status": "failed",
-                         "reason": "group_name, item_type, order1 (int), and order2 (int) are required."}
-        http_status_code = 400
-    elif item_type not in ["video", "playlist"]:
-        response_dict = {"status": "failed", "reason": "Invalid item_type. Must be 'video' or 'playlist'."}
-        http_status_code = 400
-    elif not isinstance(user_id, int) or user_id <= 0:
-        response_dict = {"status": "failed", "reason": "Invalid user_id."}
-        http_status_code = 400
-    elif order1 <= 0 or order2 <= 0:  # Order numbers should be positive
-        response_dict = {"status": "failed", "reason": "Order numbers must be positive integers."}
-        http_status_code = 400
-    elif order1 == order2:
+    if order1 == order2:
         response_dict = {"status": "success",
                          "message": "Items are already in the same order position; no switch performed."}
         http_status_code = 200
     else:
         try:
             with DB.get_cursor() as cur:
-                group_id_to_use, _ = _get_group_details(cur, user_id, group_name)
-
-                if not group_id_to_use:
+                switched = gim.switch_item_order_in_group(cur, user_id, group_name, item_type, order1, order2)
+                if switched:
+                    response_dict = {"status": "success",
+                                     "message": f"Placement of items at order {order1} and {order2} in group '{group_name}' for type '{item_type}' switched successfully."}
+                    http_status_code = 200
+                elif not _get_group_details(cur, user_id, group_name)[0]:
                     response_dict = {"status": "failed", "reason": f"Group '{group_name}' not found for this user."}
                     http_status_code = 404
                 else:
-                    switched = gim.switch_item_order_in_group(cur, group_id_to_use, item_type, order1, order2)
-                    if switched:
-                        response_dict = {"status": "success",
-                                         "message": f"Placement of items at order {order1} and {order2} in group '{group_name}' for type '{item_type}' switched successfully."}
-                        http_status_code = 200
-                    else:
-                        response_dict = {"status": "failed",
-                                         "reason": f"Could not switch items. Ensure items exist at order {order1} and {order2} of type '{item_type}' in group '{group_name}', or another error occurred."}
-                        http_status_code = 404
+                    response_dict = {"status": "failed",
+                                     "reason": f"Could not switch items. Ensure items exist at order {order1} and {order2} of type '{item_type}' in group '{group_name}', or another error occurred."}
+                    http_status_code = 404
         except Exception as e:
-            print(f"TODO: Error in switch_group_item_placement: {e}")
+            logger.exception("Error in switch_group_item_placement")
             response_dict["reason"] = f"An unexpected error occurred: {str(e)}"
 
     return response_dict, http_status_code
@@ -1,6 +1,9 @@
 import logging
+import random
+import select
+import threading
 import time
-import psycopg2.errors  # To specifically catch unique constraint errors
+import psycopg2
 from db.DB import DB  # Assuming DB class handles connection/cursor
 
 # Configure a logger for this module
@@ -9,13 +12,62 @@ logger = logging.getLogger(__name__)
 if not logger.handlers:
     logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 
-# Define the specific error code for unique violation in PostgreSQL
-UNIQUE_VIOLATION_CODE = '23505'
+# Locks are PostgreSQL session-level advisory locks keyed by hashtextextended(lock_key, 0) (a bigint).
+# They live in shared memory (no table writes) and are freed by the server if the holding session dies.
+# Being session-scoped, every lock of this process is taken and released on one dedicated connection,
+# so a lock taken by a request thread can be released by the background thread that finishes the work.
+_lock_conn = None
+_lock_conn_mutex = threading.Lock()  # Serializes use of _lock_conn and guards _held_lock_keys
+# Advisory locks are re-entrant per session, so keys this process already holds are refused here
+_held_lock_keys = set()
+# release_lock NOTIFYs this channel with the lock key, waking blocked DistributedLock waiters early
+_LOCK_RELEASED_CHANNEL = 'lock_released'
+
+
+def _get_lock_conn():
+    """Returns the process's lock connection, opening it on first use. Call with _lock_conn_mutex held."""
+    global _lock_conn
+    if _lock_conn is None or _lock_conn.closed:
+        _lock_conn = DB.open_dedicated_connection()
+    return _lock_conn
+
+
+def _reset_lock_conn():
+    """
+    Drops a broken lock connection. The server frees a dead session's advisory locks, so the keys
+    this process believed it held are forgotten too. Call with _lock_conn_mutex held.
+    """
+    global _lock_conn
+    if _lock_conn is not None:
+        try:
+            _lock_conn.close()
+        except Exception:
+            pass
+        _lock_conn = None
+    if _held_lock_keys:
+        logger.warning("Lock connection lost; advisory locks %s were released by the server.", sorted(_held_lock_keys))
+        _held_lock_keys.clear()
+
+
+def _query_lock_conn(query: str, lock_key: str):
+    """
+    Runs a single-value lock query on the lock connection and returns its result.
+    A dead connection is replaced and the query retried once. Call with _lock_conn_mutex held.
+    """
+    try:
+        with _get_lock_conn().cursor() as cur:
+            cur.execute(query, (lock_key,))
+            return cur.fetchone()[0]
+    except (psycopg2.OperationalError, psycopg2.InterfaceError):
+        _reset_lock_conn()
+        with _get_lock_conn().cursor() as cur:
+            cur.execute(query, (lock_key,))
+            return cur.fetchone()[0]
 
 
 def acquire_lock(lock_key: str) -> bool:
     """
-    Attempts to acquire a distributed lock by inserting a unique key into the Generation_Locks table.
+    Attempts to acquire a distributed lock with pg_try_advisory_lock (never waits).
 
     Args:
         lock_key (str): The unique identifier for the resource to lock (e.g., "youtubeId_language").
@@ -25,67 +77,98 @@ def acquire_lock(lock_key: str) -> bool:
     """
     acquired = False
     try:
-        with DB.get_cursor() as cur:  # Ensure commit happens if insert succeeds
-            # Attempt to insert the lock key.
-            # The primary key constraint on lock_key handles uniqueness.
-            # created_at defaults to NOW().
-            cur.execute(
-                '''INSERT INTO "Generation_Locks" (lock_key)
-                   VALUES (%s)''',
-                (lock_key,)
-            )
-            # If the insert succeeds without error, the lock is acquired
-            acquired = True
-
-    except psycopg2.errors.lookup(UNIQUE_VIOLATION_CODE) as e:
-        # This specific error means the lock_key already exists (lock is held)
+        with _lock_conn_mutex:
+            if lock_key in _held_lock_keys:
+                return False
+            acquired = _query_lock_conn('SELECT pg_try_advisory_lock(hashtextextended(%s, 0))', lock_key)
+            if acquired:
+                _held_lock_keys.add(lock_key)
+    except Exception:
+        # Handle potential database errors
+        logger.exception("Error acquiring lock for %s", lock_key)
         acquired = False
-    except Exception as e:
-        # Handle other potential database errors during insert
-        print(f"Error acquiring lock for {lock_key}: {e}")
-        acquired = False
-        # Consider re-raising the exception or logging more details if needed
 
     return acquired
 
 
 def release_lock(lock_key: str) -> bool:
     """
-    Releases a distributed lock by deleting the corresponding key from the Generation_Locks table.
+    Releases a distributed lock taken by acquire_lock in this process.
 
     Args:
         lock_key (str): The unique identifier for the resource lock to release.
 
     Returns:
-        bool: True if the lock was successfully deleted (or didn't exist), False if a DB error occurred.
+        bool: True if the lock was released (or wasn't held), False if a DB error occurred.
     """
     released = False
     try:
-        with DB.get_cursor() as cur:  # Ensure commit happens after delete
-            # Delete the lock row. It's okay if the row doesn't exist (idempotent).
-            cur.execute(
-                '''DELETE FROM "Generation_Locks"
-                   WHERE lock_key = %s''',
-                (lock_key,)
-            )
-            # Check if any row was actually deleted (optional, indicates if lock existed)
-            # rowcount = cur.rowcount
-            # print(f"Lock released for: {lock_key}. Rows affected: {rowcount}")
+        with _lock_conn_mutex:
+            if lock_key in _held_lock_keys:
+                try:
+                    with _get_lock_conn().cursor() as cur:
+                        cur.execute('SELECT pg_advisory_unlock(hashtextextended(%s, 0)), pg_notify(%s, %s)',
+                                    (lock_key, _LOCK_RELEASED_CHANNEL, lock_key))
+                except (psycopg2.OperationalError, psycopg2.InterfaceError):
+                    # The session is gone and the server already dropped its locks: nothing left to release
+                    _reset_lock_conn()
+                _held_lock_keys.discard(lock_key)
             released = True  # Consider success if no error occurs
 
-    except Exception as e:
-        # Handle potential database errors during delete
-        print(f"Error releasing lock for {lock_key}: {e}")
+    except Exception:
+        # Handle potential database errors during unlock
+        logger.exception("Error releasing lock for %s", lock_key)
         released = False
-        # Consider re-raising or logging
 
     return released
 
 
+def _open_release_listener():
+    """
+    Helper: Opens a dedicated connection LISTENing for lock releases.
+    Returns None if that fails, in which case waiters fall back to plain polling.
+    """
+    try:
+        conn = DB.open_dedicated_connection()
+        with conn.cursor() as cur:
+            cur.execute(f'LISTEN {_LOCK_RELEASED_CHANNEL}')
+        return conn
+    except Exception as e:
+        logger.warning("Could not listen for lock releases, falling back to polling: %s", e)
+        return None
+
+
+def _wait_for_release(listen_conn, lock_key: str, timeout: float):
+    """
+    Helper: Sleeps up to `timeout` seconds, returning early once `lock_key` is reported released
+    on `listen_conn`. Without a listener this is a plain sleep.
+    """
+    if listen_conn is None:
+        time.sleep(timeout)
+        return
+    deadline = time.monotonic() + timeout
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        try:
+            if not select.select([listen_conn], [], [], remaining)[0]:
+                return
+            listen_conn.poll()
+        except Exception as e:
+            logger.warning("Lock release listener failed, sleeping instead: %s", e)
+            time.sleep(max(0.0, deadline - time.monotonic()))
+            return
+        released = any(notify.payload == lock_key for notify in listen_conn.notifies)
+        listen_conn.notifies.clear()
+        if released:
+            return
+
+
 class DistributedLock:
     """
     A context manager for acquiring and releasing a distributed lock
-    using the Generation_Locks table. Can operate in blocking or non-blocking mode.
+    using PostgreSQL advisory locks. Can operate in blocking or non-blocking mode.
 
     Usage (non-blocking, default):
         try:
@@ -98,7 +181,7 @@ class DistributedLock:
 
     Usage (blocking with timeout):
         try:
-            # Will try for up to 60 seconds, retrying every 2 seconds
+            # Will try for up to 60 seconds, backing off from 0.05s up to 2 seconds between attempts
             with DistributedLock("my_resource_key", blocking=True, timeout=60, retry_interval=2):
                 # Critical section code
                 pass
@@ -110,7 +193,8 @@ class DistributedLock:
         """Custom exception for when a distributed lock cannot be acquired."""
         pass
 
-    def __init__(self, lock_key: str, blocking: bool = False, timeout: int = 600, retry_interval: float = 5.0):
+    def __init__(self, lock_key: str, blocking: bool = False, timeout: int = 600, retry_interval: float = 5.0,
+                 initial_retry_interval: float = 0.05):
         """
         Initializes the distributed lock context manager.
 
@@ -119,12 +203,15 @@ class DistributedLock:
             blocking (bool): If True, will attempt to acquire the lock repeatedly until timeout.
                              If False (default), will try once and raise LockAcquisitionFailed if unsuccessful.
             timeout (int): Maximum time in seconds to wait for the lock if blocking is True. Default is 600 (10 minutes).
-            retry_interval (float): Time in seconds to wait between retries if blocking is True. Default is 5.0 seconds.
+            retry_interval (float): Maximum time in seconds to wait between retries if blocking is True. Default is 5.0 seconds.
+            initial_retry_interval (float): First wait in seconds between retries; it doubles after every failed
+                                            attempt up to retry_interval, with random jitter. Default is 0.05 seconds.
         """
         self.lock_key = lock_key
         self.blocking = blocking
         self.timeout = timeout
         self.retry_interval = retry_interval
+        self.initial_retry_interval = min(initial_retry_interval, retry_interval)
         self._acquired_by_this_instance = False
 
     def __enter__(self):
@@ -139,35 +226,58 @@ class DistributedLock:
             self: The instance of the DistributedLock.
         """
         logger.info(
-            f"Context manager: Attempting to acquire lock for key: '{self.lock_key}' "
-            f"(blocking={self.blocking}, timeout={self.timeout}s, retry_interval={self.retry_interval}s)"
+            "Context manager: Attempting to acquire lock for key: '%s' (blocking=%s, timeout=%ss, retry_interval=%ss)",
+            self.lock_key, self.blocking, self.timeout, self.retry_interval
         )
         start_time = time.monotonic()
+        delay = self.initial_retry_interval
+        listen_conn = None
+        listening = False
 
-        while True:
-            if acquire_lock(self.lock_key):
-                self._acquired_by_this_instance = True
-                logger.info(f"Context manager: Successfully acquired lock for key: '{self.lock_key}'")
-                return self
+        try:
+            while True:
+                if acquire_lock(self.lock_key):
+                    self._acquired_by_this_instance = True
+                    logger.info("Context manager: Successfully acquired lock for key: '%s'", self.lock_key)
+                    return self
 
-            if not self.blocking:
-                logger.warning(f"Context manager: Failed to acquire lock for key '{self.lock_key}' (non-blocking).")
-                raise DistributedLock.LockAcquisitionFailed(f"Failed to acquire lock for key '{self.lock_key}' (non-blocking).")
+                if not self.blocking:
+                    logger.warning("Context manager: Failed to acquire lock for key '%s' (non-blocking).", self.lock_key)
+                    raise DistributedLock.LockAcquisitionFailed(f"Failed to acquire lock for key '{self.lock_key}' (non-blocking).")
 
-            elapsed_time = time.monotonic() - start_time
-            if elapsed_time >= self.timeout:
-                logger.error(
-                    f"Context manager: Timeout ({self.timeout}s) exceeded while trying to acquire lock for key '{self.lock_key}'."
-                )
-                raise DistributedLock.LockAcquisitionFailed(
-                    f"Timeout ({self.timeout}s) exceeded while trying to acquire lock for key '{self.lock_key}'."
-                )
+                elapsed_time = time.monotonic() - start_time
+                if elapsed_time >= self.timeout:
+                    logger.error(
+                        "Context manager: Timeout (%ss) exceeded while trying to acquire lock for key '%s'.",
+                        self.timeout, self.lock_key
+                    )
+                    raise DistributedLock.LockAcquisitionFailed(
+                        f"Timeout ({self.timeout}s) exceeded while trying to acquire lock for key '{self.lock_key}'."
+                    )
 
-            logger.info(
-                f"Context manager: Lock for key '{self.lock_key}' not acquired. Retrying in {self.retry_interval}s. "
-                f"Elapsed: {elapsed_time:.2f}s / {self.timeout}s"
-            )
-            time.sleep(self.retry_interval)
+                if not listening:
+                    # Start listening for releases, then retry at once so a release just before LISTEN isn't missed
+                    listening = True
+                    listen_conn = _open_release_listener()
+                    if listen_conn is not None:
+                        continue
+
+                # Exponential backoff capped at retry_interval, with jitter so waiters don't retry in lockstep,
+                # and never sleeping past the timeout. A release NOTIFY for this key cuts the wait short;
+                # the timed retry still covers locks freed without one (e.g. the holder's session died).
+                sleep_time = min(delay * (0.5 + random.random()), self.retry_interval, self.timeout - elapsed_time)
+                delay = min(delay * 2, self.retry_interval)
+                logger.info(
+                    "Context manager: Lock for key '%s' not acquired. Retrying in %.2fs. Elapsed: %.2fs / %ss",
+                    self.lock_key, sleep_time, elapsed_time, self.timeout
+                )
+                _wait_for_release(listen_conn, self.lock_key, sleep_time)
+        finally:
+            if listen_conn is not None:
+                try:
+                    listen_conn.close()
+                except Exception:
+                    pass
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         """
@@ -183,13 +293,14 @@ class DistributedLock:
             bool: False to propagate any exceptions that occurred within the 'with' block.
         """
         if self._acquired_by_this_instance:
-            logger.info(f"Context manager: Releasing lock for key: '{self.lock_key}'")
+            logger.info("Context manager: Releasing lock for key: '%s'", self.lock_key)
             if release_lock(self.lock_key):
-                logger.info(f"Context manager: Successfully released lock for key: '{self.lock_key}'")
+                logger.info("Context manager: Successfully released lock for key: '%s'", self.lock_key)
             else:
                 logger.error(
-                    f"Context manager: CRITICAL - Failed to release lock for key: '{self.lock_key}'. "
-                    "Manual intervention may be required."
+                    "Context manager: CRITICAL - Failed to release lock for key: '%s'. "
+                    "Manual intervention may be required.",
+                    self.lock_key
                 )
             self._acquired_by_this_instance = False
         return False
@@ -1,10 +1,143 @@
 import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from itertools import chain
 
 from db.DB import DB
 import psycopg2
+import psycopg2.errors
+from psycopg2.extras import RealDictCursor
 
 logger = logging.getLogger(__name__)
 
+# Per-process LRU of subscriber counts per playlist, see get_playlist_subscriber_count. Only the count is
+# cached; the playlist's existence and owner are always read fresh. Entries are dropped locally on
+# (un)subscribe and playlist deletion; other workers see count changes within the TTL.
+_SUBSCRIBER_COUNT_TTL = float(os.getenv("SUBSCRIBER_COUNT_CACHE_TTL", 30.0))
+_SUBSCRIBER_COUNT_CACHE_SIZE = 4096
+_subscriber_count_cache = OrderedDict()  # playlist_id -> (cached_at, count)
+_subscriber_count_lock = threading.Lock()
+
+_USER_PLAYLISTS_SQL = '''
+    SELECT playlist_id, playlist_name, permission
+    FROM "Playlist"
+    WHERE user_id = $1
+    ORDER BY playlist_id
+'''
+
+# Not a prepared statement: as PREPARE parameters the select-list values would be typed text,
+# which doesn't assign to the permission column
+_CREATE_PLAYLIST_SQL = '''
+    INSERT INTO "Playlist" (user_id, playlist_name, permission)
+    SELECT %(user_id)s, %(playlist_name)s, %(permission)s
+    WHERE NOT EXISTS (
+        SELECT 1 FROM "Playlist" WHERE user_id = %(user_id)s AND playlist_name = %(playlist_name)s
+    )
+    RETURNING playlist_id
+'''
+
+_DELETE_PLAYLIST_SQL = 'DELETE FROM "Playlist" WHERE playlist_id = $1 AND user_id = $2 RETURNING playlist_id'
+
+_UPDATE_PLAYLIST_PERMISSION_SQL = '''
+    UPDATE "Playlist" SET permission = $1
+    WHERE playlist_id = $2 AND user_id = $3
+    RETURNING playlist_id
+'''
+
+_REMOVE_PLAYLIST_ITEM_SQL = '''
+    DELETE FROM "Playlist_Item" pi
+    USING "Playlist" p
+    WHERE pi.playlist_id = p.playlist_id
+      AND pi.playlist_item_id = $1
+      AND p.user_id = $2
+    RETURNING pi.playlist_item_id
+'''
+
+_REMOVE_PLAYLIST_ITEMS_SQL = '''
+    DELETE FROM "Playlist_Item" pi
+    USING "Playlist" p
+    WHERE pi.playlist_id = p.playlist_id
+      AND pi.playlist_item_id = ANY($1)
+      AND p.user_id = $2
+    RETURNING pi.playlist_item_id
+'''
+
+_RENAME_PLAYLIST_SQL = '''
+    UPDATE "Playlist"
+    SET playlist_name = $1
+    WHERE playlist_id = (
+        SELECT playlist_id FROM "Playlist"
+        WHERE playlist_name = $2 AND user_id = $3
+        LIMIT 1
+    )
+    AND NOT EXISTS (
+        SELECT 1 FROM "Playlist" WHERE playlist_name = $1 AND user_id = $3
+    )
+    RETURNING playlist_id
+'''
+
+# One row per subscriber, each carrying the playlist owner; a playlist without subscribers
+# still yields one row (with NULL subscriber columns), and an unknown playlist yields none
+_PLAYLIST_SUBSCRIBERS_SQL = '''
+    SELECT p.user_id, u.email, TRIM(CONCAT_WS(' ', u.first_name, u.last_name)) AS full_name
+    FROM "Playlist" p
+    LEFT JOIN "Subscription" s ON s.playlist_id = p.playlist_id
+    LEFT JOIN "User" u ON u.user_id = s.user_id
+    WHERE p.playlist_id = $1
+'''
+
+_PLAYLIST_OWNER_SQL = 'SELECT user_id FROM "Playlist" WHERE playlist_id = $1'
+
+_PLAYLIST_SUBSCRIBER_COUNT_SQL = '''
+    SELECT p.user_id, (SELECT COUNT(*) FROM "Subscription" s WHERE s.playlist_id = p.playlist_id)
+    FROM "Playlist" p
+    WHERE p.playlist_id = $1
+'''
+
+
+def invalidate_subscriber_count(playlist_id):
+    """Drops the cached subscriber count of a playlist; call after its subscriptions change."""
+    with _subscriber_count_lock:
+        _subscriber_count_cache.pop(playlist_id, None)
+
+
+def _get_owner_and_subscriber_count(playlist_id):
+    """
+    Helper: Returns (owner_id, subscriber_count) for a playlist, or None if it doesn't exist.
+    The owner is always read from the database, so a deleted or transferred playlist is never answered
+    from the cache; only the count is served from the per-process cache while younger than
+    _SUBSCRIBER_COUNT_TTL. Either way this is one round-trip.
+    """
+    now = time.monotonic()
+    with _subscriber_count_lock:
+        cached = _subscriber_count_cache.get(playlist_id)
+        if cached and now - cached[0] < _SUBSCRIBER_COUNT_TTL:
+            _subscriber_count_cache.move_to_end(playlist_id)
+        else:
+            cached = None
+
+    with DB.get_cursor() as cur:
+        if cached:
+            DB.execute_prepared(cur, "get_playlist_owner", _PLAYLIST_OWNER_SQL, (playlist_id,))
+        else:
+            # Owner and subscriber count in one query
+            DB.execute_prepared(cur, "get_playlist_subscriber_count", _PLAYLIST_SUBSCRIBER_COUNT_SQL, (playlist_id,))
+        row = cur.fetchone()
+    if row is None:
+        invalidate_subscriber_count(playlist_id)
+        return None
+    if cached:
+        return row[0], cached[1]
+
+    with _subscriber_count_lock:
+        _subscriber_count_cache[playlist_id] = (now, row[1])
+        _subscriber_count_cache.move_to_end(playlist_id)
+        while len(_subscriber_count_cache) > _SUBSCRIBER_COUNT_CACHE_SIZE:
+            _subscriber_count_cache.popitem(last=False)
+    return row[0], row[1]
+
 
 def create_playlist(user_id, playlist_name, playlist_permission='unlisted'):
     """
@@ -22,23 +155,19 @@ def create_playlist(user_id, playlist_name, playlist_permission='unlisted'):
     """
     try:
         with DB.get_cursor() as cur:
-            # Check if a playlist with the given name already exists for this user.
-            cur.execute(
-                'SELECT playlist_id FROM "Playlist" WHERE user_id = %s AND playlist_name = %s',
-                (user_id, playlist_name)
-            )
-            if cur.fetchone():
+            # Insert the new playlist unless the user already has one with that name;
+            # no row comes back when the name is taken.
+            cur.execute(_CREATE_PLAYLIST_SQL,
+                        {"user_id": user_id, "playlist_name": playlist_name, "permission": playlist_permission})
+            row = cur.fetchone()
+            if row is None:
                 return {"status": "failed", "reason": "Playlist with that name already exists"}, 400
-
-            # Insert the new playlist; permission defaults to 'unlisted'.
-            cur.execute(
-                'INSERT INTO "Playlist" (user_id, playlist_name, permission) VALUES (%s, %s, %s) RETURNING playlist_id',
-                (user_id, playlist_name, playlist_permission)
-            )
-            new_playlist_id = cur.fetchone()[0]
-            return {"status": "success", "playlist_id": new_playlist_id}, 200
-    except Exception as e:
-        print(e)
+            return {"status": "success", "playlist_id": row[0]}, 200
+    except psycopg2.errors.UniqueViolation:
+        # A concurrent request created the same playlist between the check and the insert
+        return {"status": "failed", "reason": "Playlist with that name already exists"}, 400
+    except Exception:
+        logger.exception("Failed to create playlist '%s' for user %s", playlist_name, user_id)
         return {"status": "failed", "reason": "failed to create playlist"}, 500
 
 
@@ -57,22 +186,14 @@ def delete_playlist(user_id, playlist_id):
     """
     try:
         with DB.get_cursor() as cur:
-            # Ensure the playlist exists and belongs to the user.
-            cur.execute(
-                'SELECT playlist_id FROM "Playlist" WHERE playlist_id = %s AND user_id = %s',
-                (playlist_id, user_id)
-            )
-            if cur.fetchone() is None:
+            # Delete the playlist; no row is affected if it doesn't exist or belongs to someone else.
+            DB.execute_prepared(cur, "delete_playlist", _DELETE_PLAYLIST_SQL, (playlist_id, user_id))
+            if cur.rowcount == 0:
                 return {"status": "failed", "reason": "Playlist not found"}, 404
-
-            # Delete the playlist.
-            cur.execute(
-                'DELETE FROM "Playlist" WHERE playlist_id = %s AND user_id = %s',
-                (playlist_id, user_id)
-            )
-            return {"status": "success", "reason": "Playlist deleted"}, 200
-    except Exception as e:
-        print(e)
+        invalidate_subscriber_count(playlist_id)
+        return {"status": "success", "reason": "Playlist deleted"}, 200
+    except Exception:
+        logger.exception("Failed to delete playlist %s for user %s", playlist_id, user_id)
         return {"status": "failed", "reason": "failed to delete playlist"}, 500
 
 
@@ -90,18 +211,13 @@ def get_all_user_playlists(user_id):
     """
     try:
         with DB.get_cursor() as cur:
-            cur.execute(
-                'SELECT playlist_id, playlist_name, permission FROM "Playlist" WHERE user_id = %s ORDER BY playlist_id',
-                (user_id,)
-            )
-            rows = cur.fetchall()
-            playlists = [
-                {"playlist_id": row[0], "playlist_name": row[1], "permission": row[2]}
-                for row in rows
-            ]
+            # Rows come back as dictionaries straight from psycopg2, on the same connection/transaction
+            with cur.connection.cursor(cursor_factory=RealDictCursor) as dict_cur:
+                DB.execute_prepared(dict_cur, "get_all_user_playlists", _USER_PLAYLISTS_SQL, (user_id,))
+                playlists = dict_cur.fetchall()
             return {"status": "success", "playlists": playlists}, 200
-    except Exception as e:
-        print(e)
+    except Exception:
+        logger.exception("Failed to fetch playlists for user %s", user_id)
         return {"status": "failed", "reason": "failed to fetch playlists"}, 500
 
 
@@ -121,29 +237,25 @@ def update_playlist_permission(user_id, playlist_id, new_permission):
     """
     try:
         with DB.get_cursor() as cur:
-            # Ensure the playlist belongs to the user.
-            cur.execute(
-                'SELECT playlist_id FROM "Playlist" WHERE playlist_id = %s AND user_id = %s',
-                (playlist_id, user_id)
-            )
-            if cur.fetchone() is None:
+            # Update the permission; no row is affected if the playlist isn't owned by the user.
+            DB.execute_prepared(cur, "update_playlist_permission", _UPDATE_PLAYLIST_PERMISSION_SQL,
+                                (new_permission, playlist_id, user_id))
+            if cur.rowcount == 0:
                 return {"status": "failed", "reason": "Playlist not found or not owned by user"}, 404
-
-            # Update the permission.
-            cur.execute(
-                'UPDATE "Playlist" SET permission = %s WHERE playlist_id = %s AND user_id = %s',
-                (new_permission, playlist_id, user_id)
-            )
             return {"status": "success", "reason": "Permission updated"}, 200
-    except Exception as e:
-        print(e)
+    except Exception:
+        logger.exception("Failed to update permission of playlist %s for user %s", playlist_id, user_id)
         return {"status": "failed", "reason": "failed to update permission"}, 500
 
 
 def remove_from_playlist(user_id, data):
     """
     Removes a playlist item using the DB context manager.
+    Several items can be removed in one call by passing "playlist_item_ids" (a list) instead of "playlist_item_id".
     """
+    if "playlist_item_ids" in data:
+        return _remove_playlist_items(user_id, data.get("playlist_item_ids"))
+
     playlist_item_id = data.get("playlist_item_id")
     if not playlist_item_id:
         return {"status": "failed", "reason": "missing playlist_item_id"}, 400
@@ -151,41 +263,69 @@ def remove_from_playlist(user_id, data):
     try:
         # Use the context manager
         with DB.get_cursor() as cur:
-            # Verify the playlist item belongs to a playlist owned by the user.
-            cur.execute("""
-                SELECT p.user_id
-                FROM "Playlist_Item" pi
-                JOIN "Playlist" p ON pi.playlist_id = p.playlist_id
-                WHERE pi.playlist_item_id = %s
-            """, (playlist_item_id,))
-            result = cur.fetchone()
-
-            if result is None:
-                # No DB change, context manager handles connection return
-                return {"status": "failed", "reason": "playlist item not found"}, 404 # Changed to 404 Not Found
-
-            owner_user_id = result[0]
-            if owner_user_id != user_id:
-                 # No DB change, context manager handles connection return
+            # Delete the playlist item only if it belongs to a playlist owned by the user.
+            DB.execute_prepared(cur, "remove_from_playlist", _REMOVE_PLAYLIST_ITEM_SQL, (playlist_item_id, user_id))
+
+            if cur.rowcount == 0:
+                # Nothing deleted: only now look up whether the item is missing or someone else's
+                cur.execute('SELECT 1 FROM "Playlist_Item" WHERE playlist_item_id = %s', (playlist_item_id,))
+                if cur.fetchone() is None:
+                    return {"status": "failed", "reason": "playlist item not found"}, 404 # Changed to 404 Not Found
                 return {"status": "failed", "reason": "not authorized to remove this playlist item"}, 403 # Changed to 403 Forbidden
-
-            # Delete the playlist item.
-            cur.execute("""
-                DELETE FROM "Playlist_Item"
-                WHERE playlist_item_id = %s
-            """, (playlist_item_id,))
             # Commit is handled automatically by the context manager on successful exit
 
         # Return success outside the 'with' block
         return {"status": "success", "reason": "", "removed_playlist_item_id": playlist_item_id}, 200
 
-    except Exception as e:
-        logger.error(f"Failed to remove playlist item {playlist_item_id} for user {user_id}: {e}", exc_info=True)
+    except Exception:
+        logger.exception("Failed to remove playlist item %s for user %s", playlist_item_id, user_id)
         # Rollback is handled automatically by the context manager on exception
         # Return a generic server error
         return {"status": "failed", "reason": "failed to remove playlist item"}, 500
 
 
+def _remove_playlist_items(user_id, playlist_item_ids):
+    """
+    Helper: Removes several playlist items of the user's playlists with a single DELETE.
+    Items that don't exist or belong to someone else's playlist are reported back, not removed.
+    """
+    if (not isinstance(playlist_item_ids, list) or not playlist_item_ids
+            or not all(isinstance(i, int) and not isinstance(i, bool) and i > 0 for i in playlist_item_ids)):
+        return {"status": "failed", "reason": "playlist_item_ids must be a non-empty list of positive integers"}, 400
+    playlist_item_ids = list(dict.fromkeys(playlist_item_ids))
+
+    try:
+        with DB.get_cursor() as cur:
+            DB.execute_prepared(cur, "remove_items_from_playlist", _REMOVE_PLAYLIST_ITEMS_SQL,
+                                (playlist_item_ids, user_id))
+            removed = {row[0] for row in cur.fetchall()}
+
+            not_found, not_authorized = [], []
+            failed = [i for i in playlist_item_ids if i not in removed]
+            if failed:
+                # Only now look up which of the leftovers exist (and so belong to another user)
+                cur.execute('SELECT playlist_item_id FROM "Playlist_Item" WHERE playlist_item_id = ANY(%s)', (failed,))
+                existing = {row[0] for row in cur.fetchall()}
+                not_found = [i for i in failed if i not in existing]
+                not_authorized = [i for i in failed if i in existing]
+
+        if not removed:
+            if not_authorized:
+                return {"status": "failed", "reason": "not authorized to remove these playlist items",
+                        "not_found_playlist_item_ids": not_found,
+                        "not_authorized_playlist_item_ids": not_authorized}, 403
+            return {"status": "failed", "reason": "playlist items not found",
+                    "not_found_playlist_item_ids": not_found}, 404
+        return {"status": "success", "reason": "",
+                "removed_playlist_item_ids": [i for i in playlist_item_ids if i in removed],
+                "not_found_playlist_item_ids": not_found,
+                "not_authorized_playlist_item_ids": not_authorized}, 200
+
+    except Exception:
+        logger.exception("Failed to remove playlist items %s for user %s", playlist_item_ids, user_id)
+        return {"status": "failed", "reason": "failed to remove playlist items"}, 500
+
+
 def update_playlist_name(user_id, data):
     """
     Updates the name of a user's playlist using the DB context manager.
@@ -199,40 +339,30 @@ def update_playlist_name(user_id, data):
     try:
          # Use the context manager
         with DB.get_cursor() as cur:
-            # Check if new name already exists for this user (optional but good practice)
-            cur.execute("""
-                SELECT 1 FROM "Playlist" WHERE playlist_name = %s AND user_id = %s LIMIT 1
-            """, (new_name, user_id))
-            if cur.fetchone():
-                 return {"status": "failed", "reason": f"Playlist with name '{new_name}' already exists"}, 400
-
-            # Find the playlist by old name
-            cur.execute("""
-                SELECT playlist_id FROM "Playlist"
-                WHERE playlist_name = %s AND user_id = %s
-                LIMIT 1
-            """, (old_name, user_id))
+            # Rename in one statement; it is skipped if the user already has a playlist named new_name
+            DB.execute_prepared(cur, "rename_playlist", _RENAME_PLAYLIST_SQL, (new_name, old_name, user_id))
             result = cur.fetchone()
 
             if result is None:
-                 # No DB change, context manager handles connection return
+                # Nothing renamed: only now look up which check failed
+                cur.execute("""
+                    SELECT 1 FROM "Playlist" WHERE playlist_name = %s AND user_id = %s LIMIT 1
+                """, (new_name, user_id))
+                if cur.fetchone():
+                    return {"status": "failed", "reason": f"Playlist with name '{new_name}' already exists"}, 400
                 return {"status": "failed", "reason": f"Playlist with name '{old_name}' not found"}, 404
 
             playlist_id = result[0]
-
-            # Update the playlist name.
-            cur.execute("""
-                UPDATE "Playlist"
-                SET playlist_name = %s
-                WHERE playlist_id = %s
-            """, (new_name, playlist_id))
             # Commit is handled automatically by context manager on successful exit
 
         # Return success outside 'with' block
         return {"status": "success", "reason": "Playlist name updated", "playlist_id": playlist_id}, 200
 
-    except Exception as e:
-        logger.error(f"Failed to update playlist name from '{old_name}' for user {user_id}: {e}", exc_info=True)
+    except psycopg2.errors.UniqueViolation:
+        # A concurrent request took new_name between the check and the update
+        return {"status": "failed", "reason": f"Playlist with name '{new_name}' already exists"}, 400
+    except Exception:
+        logger.exception("Failed to update playlist name from '%s' for user %s", old_name, user_id)
          # Rollback is handled automatically by context manager on exception
         return {"status": "failed", "reason": "failed to update playlist name"}, 500
 
@@ -244,38 +374,26 @@ def get_playlist_subscribers(owner_id, playlist_id):
     """
     try:
         with DB.get_cursor() as cur:
-            # Verify ownership
-            cur.execute('SELECT user_id FROM "Playlist" WHERE playlist_id = %s', (playlist_id,))
-            row = cur.fetchone()
-            if row is None:
+            # Ownership and subscribers in one query; every row carries the owner
+            DB.execute_prepared(cur, "get_playlist_subscribers", _PLAYLIST_SUBSCRIBERS_SQL, (playlist_id,))
+            first_row = cur.fetchone()
+            if first_row is None:
                 return {"status": "failed", "reason": "Playlist not found"}, 404
 
-            if row[0] != owner_id:
+            if first_row[0] != owner_id:
                 return {"status": "failed", "reason": "Not authorized"}, 403
 
-            # Retrieve subscribers
-            cur.execute(
-                '''
-                SELECT u.email, u.first_name, u.last_name
-                FROM "Subscription" s
-                JOIN "User" u ON s.user_id = u.user_id
-                WHERE s.playlist_id = %s
-                ''',
-                (playlist_id,)
-            )
-            rows = cur.fetchall()
-            # No commit/rollback needed for SELECT
+            # No commit/rollback needed for SELECT.
+            # Rows are consumed straight off the cursor, without an intermediate fetchall() list.
             subscribers = [
-                {
-                    "email": r[0],
-                    "full_name": f"{r[1] or ''} {r[2] or ''}".strip()
-                }
-                for r in rows
+                {"email": email, "full_name": full_name}
+                for _, email, full_name in chain((first_row,), cur)
+                if email is not None  # The placeholder row of a playlist with no subscribers
             ]
         return {"status": "success", "subscribers": subscribers}, 200
 
-    except Exception as e: # Catch any other errors
-        logger.error(f"Error getting subscribers for playlist {playlist_id}, owner {owner_id}: {e}", exc_info=True)
+    except Exception: # Catch any other errors
+        logger.exception("Error getting subscribers for playlist %s, owner %s", playlist_id, owner_id)
         return {"status": "failed", "reason": "failed to get subscribers"}, 500
 
 
@@ -299,29 +417,15 @@ def get_playlist_subscriber_count(owner_id, playlist_id):
                 { "status": "failed", "reason": <error message> }
     """
     try:
-        with DB.get_cursor() as cur:
-            # Verify ownership
-            cur.execute('SELECT user_id FROM "Playlist" WHERE playlist_id = %s', (playlist_id,))
-            row = cur.fetchone()
-            if row is None:
-                return {"status": "failed", "reason": "Playlist not found"}, 404
-
-            playlist_owner = row[0]
-            if playlist_owner != owner_id:
-                return {"status": "failed", "reason": "Not authorized to view subscriber for this playlist"}, 403
-
-            # Count the subscribers
-            cur.execute(
-                '''
-                SELECT COUNT(*)
-                FROM "Subscription"
-                WHERE playlist_id = %s
-                ''',
-                (playlist_id,)
-            )
-            count = cur.fetchone()[0]
-
-            return {"status": "success", "count": count}, 200
-    except Exception as e:
-        print("Error in get_playlist_subscriber_count:", e)
-        return {"status": "failed", "reason": str(e)}, 500
+        result = _get_owner_and_subscriber_count(playlist_id)
+        if result is None:
+            return {"status": "failed", "reason": "Playlist not found"}, 404
+
+        playlist_owner, count = result
+        if playlist_owner != owner_id:
+            return {"status": "failed", "reason": "Not authorized to view subscriber for this playlist"}, 403
+
+        return {"status": "success", "count": count}, 200
+    except Exception:
+        logger.exception("Error getting subscriber count for playlist %s, owner %s", playlist_id, owner_id)
+        return {"status": "failed", "reason": "failed to get subscriber count"}, 500
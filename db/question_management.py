@@ -1,4 +1,5 @@
 import datetime
+from psycopg2.extras import execute_values
 from db.DB import DB
 
 
@@ -9,6 +10,13 @@ def parse_hhmmss_to_time(time_str):
     """
     if not time_str:
         return None
+    # Fast path for the documented zero-padded "HH:MM:SS" shape; anything else goes through strptime
+    if (len(time_str) == 8 and time_str[2] == ':' and time_str[5] == ':'
+            and time_str[0:2].isdigit() and time_str[3:5].isdigit() and time_str[6:8].isdigit()):
+        try:
+            return datetime.time(int(time_str[0:2]), int(time_str[3:5]), int(time_str[6:8]))
+        except ValueError:
+            pass  # Out-of-range fields: let strptime report them as before
     try:
         # Use strptime to parse the time string
         parsed_time = datetime.datetime.strptime(time_str, '%H:%M:%S').time()
@@ -70,41 +78,39 @@ def store_questions_in_db(youtube_id, language, questions):
                 print(f"Clearing existing questions for group_id: {group_id}")
                 cur.execute('DELETE FROM "Question" WHERE question_group_id = %s', (group_id,))
 
-            # 4) Insert each new question into Question, linked to the group_id.
+            # 4) Insert all new questions into Question, linked to the group_id, in one multi-row INSERT.
+            rows = []
             for q in questions:
-                # --- Extract fields ---
-                q_id = q.get("q_id")
-                question_origin_str = q.get("question_origin")
-                question_explanation_end_str = q.get("question_explanation_end")
-                difficulty = q.get("difficulty")
-                keywords = q.get("keywords")
-                question_txt = q.get("question")
-                answer1 = q.get("answer1")
-                answer2 = q.get("answer2")
-                answer3 = q.get("answer3")
-                answer4 = q.get("answer4")
-                explanation_snippet = q.get("explanation_snippet")
-
                 # --- Data Type Preparations ---
-                question_origin_time = parse_hhmmss_to_time(question_origin_str)
-                question_explanation_end_time = parse_hhmmss_to_time(question_explanation_end_str)
-                db_keywords = keywords if isinstance(keywords, list) else None
-                db_difficulty = int(difficulty) if difficulty is not None else None
-
-                # --- Execute INSERT ---
-                cur.execute(
+                keywords = q.get("keywords")
+                difficulty = q.get("difficulty")
+                rows.append((
+                    group_id,
+                    q.get("q_id"),
+                    parse_hhmmss_to_time(q.get("question_origin")),
+                    parse_hhmmss_to_time(q.get("question_explanation_end")),
+                    int(difficulty) if difficulty is not None else None,
+                    keywords if isinstance(keywords, list) else None,
+                    q.get("question"),
+                    q.get("answer1"),
+                    q.get("answer2"),
+                    q.get("answer3"),
+                    q.get("answer4"),
+                    q.get("explanation_snippet"),
+                ))
+
+            if rows:
+                execute_values(
+                    cur,
                     '''INSERT INTO "Question" (
                            question_group_id, q_id, question_origin, question_explanation_end,
                            difficulty, keywords, question, answer1, answer2, answer3, answer4,
                            explanation_snippet
                        )
-                       VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                       VALUES %s
                     ''',
-                    (
-                        group_id, q_id, question_origin_time, question_explanation_end_time,
-                        db_difficulty, db_keywords, question_txt, answer1, answer2, answer3,
-                        answer4, explanation_snippet
-                    )
+                    rows,
+                    page_size=500
                 )
 
             # Commit happens automatically when 'with' block exits without error
@@ -128,7 +134,7 @@ def time_to_hhmmss(time_obj):
         # return ""
     # Ensure time_obj is actually a datetime.time object
     if isinstance(time_obj, datetime.time):
-        return time_obj.strftime("%H:%M:%S")
+        return f"{time_obj.hour:02d}:{time_obj.minute:02d}:{time_obj.second:02d}"
     else:
         # Handle cases where DB might return something else unexpectedly
         print(f"Warning: Expected datetime.time object, got {type(time_obj)}. Returning None.")
@@ -175,44 +181,31 @@ def get_questions_for_video(youtube_id, language):
 
     try:
         with DB.get_cursor() as cur:
-            # 1) Find the question_group row
+            # 1) Fetch all questions of the matching question_group in one query.
+            # (youtube_id, language) is unique, so the join yields that single group's questions;
+            # a missing group and a group without questions both come back empty.
             cur.execute(
-                '''SELECT question_group_id
-                   FROM "Question_Group"
-                   WHERE youtube_id = %s AND language = %s
-                   LIMIT 1''',
+                '''SELECT q.q_id,                     -- 0
+                          q.question_origin,          -- 1
+                          q.question_explanation_end, -- 2 (New)
+                          q.difficulty,               -- 3 (New)
+                          q.keywords,                 -- 4 (New)
+                          q.question,                 -- 5
+                          q.answer1,                  -- 6
+                          q.answer2,                  -- 7
+                          q.answer3,                  -- 8
+                          q.answer4,                  -- 9
+                          q.explanation_snippet       -- 10 (New)
+                   FROM "Question_Group" g
+                   JOIN "Question" q ON q.question_group_id = g.question_group_id
+                   WHERE g.youtube_id = %s AND g.language = %s
+                   ORDER BY q.question_id''',  # Order by insertion order/primary key
                 (youtube_id, language)
             )
-            row = cur.fetchone()
-            if row is None:
-                #print(f"Info: No question group found for youtube_id={youtube_id}, language={language}")
-                return empty_result  # No questions found
 
-            question_group_id = row[0]
-
-            # 2) Fetch all related questions, including the new columns
-            cur.execute(
-                '''SELECT q_id,                     -- 0
-                          question_origin,          -- 1
-                          question_explanation_end, -- 2 (New)
-                          difficulty,               -- 3 (New)
-                          keywords,                 -- 4 (New)
-                          question,                 -- 5
-                          answer1,                  -- 6
-                          answer2,                  -- 7
-                          answer3,                  -- 8
-                          answer4,                  -- 9
-                          explanation_snippet       -- 10 (New)
-                   FROM "Question"
-                   WHERE question_group_id = %s
-                   ORDER BY question_id''',  # Order by insertion order/primary key
-                (question_group_id,)
-            )
-            rows = cur.fetchall()
-
-            # 3) Build the "questions" list
+            # 2) Build the "questions" list straight off the cursor (no intermediate fetchall() list)
             questions_list = []
-            for r in rows:
+            for r in cur:
                 # Extract data using indices based on SELECT statement
                 # Handle potential None values returned from DB for nullable columns
                 q_id = r[0]
@@ -246,7 +239,7 @@ def get_questions_for_video(youtube_id, language):
                     "explanation_snippet": explanation_snippet  # New, string or None
                 })
 
-            # 4) Return final JSON structure
+            # 3) Return final JSON structure
             return {
                 "id": youtube_id,
                 "video_questions": {
@@ -267,8 +260,8 @@ def questions_ready(youtube_id, language="Hebrew"):
     Checks if questions for the given YouTube video and language are ready.
 
     The method:
-      1. Looks for a Question_Group row matching the youtube_id and language.
-      2. If found, counts the number of Question rows linked to that group.
+      Checks in a single query whether any Question row is linked to a Question_Group
+      matching the youtube_id and language.
 
     Args:
       youtube_id (str): The YouTube video ID.
@@ -279,24 +272,17 @@ def questions_ready(youtube_id, language="Hebrew"):
     """
     try:
         with DB.get_cursor() as cur:
-            # Find the matching Question_Group row.
+            # One query: stops at the first question of the matching Question_Group instead of counting them all.
             cur.execute(
-                'SELECT question_group_id FROM "Question_Group" WHERE youtube_id = %s AND language = %s LIMIT 1',
+                '''SELECT EXISTS (
+                       SELECT 1
+                       FROM "Question" q
+                       JOIN "Question_Group" g ON q.question_group_id = g.question_group_id
+                       WHERE g.youtube_id = %s AND g.language = %s
+                   )''',
                 (youtube_id, language)
             )
-            row = cur.fetchone()
-            if row is None:
-                return False
-
-            question_group_id = row[0]
-
-            # Count questions in the Question table for this group.
-            cur.execute(
-                'SELECT COUNT(*) FROM "Question" WHERE question_group_id = %s',
-                (question_group_id,)
-            )
-            count = cur.fetchone()[0]
-            return count
+            return cur.fetchone()[0]
     except Exception as e:
         print("Error checking questions_ready:", e)
         return False
@@ -1,5 +1,6 @@
 import psycopg2 # Import for specific error handling like UniqueViolation
 from db.DB import DB
+from db.playlists_management import invalidate_subscriber_count
 
 
 def subscribe_playlist(owner_id, data):
@@ -82,6 +83,10 @@ def subscribe_playlist(owner_id, data):
                             status_code = 409 # Conflict - Indicates the request cannot be processed because of conflict
                         # Other psycopg2 errors during INSERT will be caught by the outer db_err handler below
 
+            if response["status"] == "success":
+                # The change is committed now; drop this playlist's cached subscriber count
+                invalidate_subscriber_count(playlist_id)
+
     except psycopg2.Error as db_err:
         # Handle general database errors (connection, syntax, etc.) not caught specifically above
         print(f"Database error in subscribe_playlist: {db_err}")
@@ -171,6 +176,10 @@ def unsubscribe_playlist(owner_id, data):
                             status_code = 200 # OK - Or 204 No Content if you prefer not to send a body on success
                             # If using 204, the response dict might be ignored by the framework/client
 
+            if response["status"] == "success":
+                # The change is committed now; drop this playlist's cached subscriber count
+                invalidate_subscriber_count(playlist_id)
+
     except psycopg2.Error as db_err:
         # Handle general database errors
         print(f"Database error in unsubscribe_playlist: {db_err}")
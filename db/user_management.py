@@ -1,13 +1,34 @@
+import logging
 import bcrypt
 import uuid
-from datetime import datetime, timedelta
+from datetime import timedelta
 
 import db.email_confirmation_management as ecm
-import psycopg2.errors
 import psycopg2.extras
 
 from db.DB import DB
 
+logger = logging.getLogger(__name__)
+
+_SESSION_LIFETIME = timedelta(days=1)
+# Sessions are only re-extended once their expiry has fallen this far behind now + _SESSION_LIFETIME
+_SESSION_EXTEND_INTERVAL = timedelta(minutes=1)
+
+# Hot-path statements, run through DB.execute_prepared so each pooled connection plans them once
+_LOGIN_LOOKUP_SQL = 'SELECT user_id, password, active FROM "User" WHERE email = $1'
+# Looks a live session up and, only when its expiry is due for extension, bumps it in the same statement
+_VALIDATE_SESSION_SQL = '''
+    WITH live AS (
+        SELECT user_id, expires_at <= NOW() + $2::interval AS needs_extension
+        FROM "Sessions"
+        WHERE session_id = $1 AND expires_at > NOW()
+    ), extended AS (
+        UPDATE "Sessions" SET expires_at = NOW() + $3::interval
+        WHERE session_id = $1 AND (SELECT needs_extension FROM live)
+    )
+    SELECT user_id FROM live
+'''
+
 
 def login_user(data):
     """
@@ -29,7 +50,7 @@ def login_user(data):
         else:
             with DB.get_cursor() as cur:
                 # Fetch user_id, hashed password, and active status
-                cur.execute('SELECT user_id, password, active FROM "User" WHERE email = %s', (email,))
+                DB.execute_prepared(cur, "login_lookup", _LOGIN_LOOKUP_SQL, (email,))
                 result = cur.fetchone()
                 if result is None:
                     response_dict = {"status": "failed", "reason": "Email not registered or incorrect."}
@@ -47,16 +68,15 @@ def login_user(data):
                     else:
                         # Credentials correct and user is active, proceed to create session
                         generated_session_id = str(uuid.uuid4())
-                        expires_at = datetime.now() + timedelta(days=1)
                         cur.execute(
-                            'INSERT INTO "Sessions" (session_id, user_id, created_at, expires_at) VALUES (%s, %s, NOW(), %s)',
-                            (generated_session_id, user_id, expires_at)
+                            'INSERT INTO "Sessions" (session_id, user_id, created_at, expires_at) VALUES (%s, %s, NOW(), NOW() + %s)',
+                            (generated_session_id, user_id, _SESSION_LIFETIME)
                         )
                         response_dict = {"status": "success", "reason": "Login successful.", "user_id": user_id}
                         http_status_code = 200
                         session_id_to_return = generated_session_id
-    except Exception as e:
-        print(f"TODO: Login exception: {e}")
+    except Exception:
+        logger.exception("Login failed")
         # response_dict and http_status_code are already set to a default server error
         # session_id_to_return remains None
 
@@ -85,33 +105,31 @@ def register_user(data):
                              "reason": "Missing required registration fields (email, password, first_name, last_name)."}
             http_status_code = 400
         else:
+            hashed_password = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
             with DB.get_cursor() as cur:
-                cur.execute('SELECT user_id FROM "User" WHERE email = %s', (email,))
-                if cur.fetchone():
-                    response_dict = {"status": "failed", "reason": "This email address is already registered."}
-                    http_status_code = 409  # Conflict
+                # User is inserted with active=FALSE by default (as per DB schema from previous steps).
+                # An already registered email returns no row; other constraint violations still raise.
+                if age is not None:
+                    cur.execute(
+                        'INSERT INTO "User" (first_name, last_name, email, password, age) VALUES (%s, %s, %s, %s, %s) '
+                        'ON CONFLICT (email) DO NOTHING RETURNING user_id',
+                        (first_name, last_name, email, hashed_password, age)
+                    )
                 else:
-                    hashed_password = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
-                    # User is inserted with active=FALSE by default (as per DB schema from previous steps)
-                    if age is not None:
-                        cur.execute(
-                            'INSERT INTO "User" (first_name, last_name, email, password, age) VALUES (%s, %s, %s, %s, %s) RETURNING user_id',
-                            (first_name, last_name, email, hashed_password, age)
-                        )
-                    else:
-                        cur.execute(
-                            'INSERT INTO "User" (first_name, last_name, email, password) VALUES (%s, %s, %s, %s) RETURNING user_id',
-                            (first_name, last_name, email, hashed_password)
-                        )
-                    user_row = cur.fetchone()
+                    cur.execute(
+                        'INSERT INTO "User" (first_name, last_name, email, password) VALUES (%s, %s, %s, %s) '
+                        'ON CONFLICT (email) DO NOTHING RETURNING user_id',
+                        (first_name, last_name, email, hashed_password)
+                    )
+                user_row = cur.fetchone()
 
             if user_row is None:
-                response_dict = {"status": "failed", "reason": "Failed to create user account in the database."}
-                # http_status_code remains 500
+                response_dict = {"status": "failed", "reason": "This email address is already registered."}
+                http_status_code = 409  # Conflict
             else:
                 user_id_registered = user_row[0]
 
-                passcode_sent, email_error_msg = ecm.send_registration_confirmation_email(
+                email_queued, email_error_msg = ecm.send_registration_confirmation_email(
                     user_id=user_id_registered,
                     email=email,
                     first_name=first_name,
@@ -119,8 +137,8 @@ def register_user(data):
                 )
 
                 if email_error_msg:
-                    print(
-                        f"TODO: Registration for {email} succeeded, but sending confirmation email failed: {email_error_msg}")
+                    logger.warning("Registration for %s succeeded, but sending confirmation email failed: %s",
+                                   email, email_error_msg)
                     response_dict = {
                         "status": "success_with_warning",
                         "user_id": user_id_registered,
@@ -128,7 +146,7 @@ def register_user(data):
                         "email_error_details": email_error_msg
                     }
                     http_status_code = 201  # Created, but with a follow-up needed
-                elif passcode_sent:
+                elif email_queued:
                     response_dict = {
                         "status": "success",
                         "user_id": user_id_registered,
@@ -144,12 +162,8 @@ def register_user(data):
                     }
                     http_status_code = 201
 
-    except psycopg2.errors.UniqueViolation:
-        response_dict = {"status": "failed",
-                         "reason": "This email address is already registered (encountered during insert)."}
-        http_status_code = 409
-    except Exception as e:
-        print(f"TODO: Registration exception: {e}")
+    except Exception:
+        logger.exception("Registration failed")
         # response_dict and http_status_code are already set to a default server error
 
     return response_dict, http_status_code
@@ -158,24 +172,22 @@ def register_user(data):
 def _validate_and_extend_session(session_id):
     """
     Common helper: Checks if the session exists and is not expired.
-    If valid, extends its expiration and returns (user_id, 200).
+    If valid, extends its expiration (at most once per _SESSION_EXTEND_INTERVAL) and returns (user_id, 200).
     On failure, returns (None, status_code).
     """
     try:
         with DB.get_cursor() as cur:
-            cur.execute('SELECT user_id, expires_at FROM "Sessions" WHERE session_id = %s', (session_id,))
+            # Expired and unknown sessions both come back empty; the server's clock decides.
+            # Only write when the expiry would move meaningfully; most requests stay read-only
+            DB.execute_prepared(cur, "validate_session", _VALIDATE_SESSION_SQL,
+                                (session_id, _SESSION_LIFETIME - _SESSION_EXTEND_INTERVAL, _SESSION_LIFETIME))
             result = cur.fetchone()
             if result is None:
                 return None, 401
-            user_id, expires_at = result
-            now = datetime.now()
-            if now > expires_at:
-                return None, 401
-            new_expires_at = now + timedelta(days=1)
-            cur.execute('UPDATE "Sessions" SET expires_at = %s WHERE session_id = %s', (new_expires_at, session_id))
+            user_id = result[0]
             return user_id, 200
-    except Exception as e:
-        print(e)
+    except Exception:
+        logger.exception("Session validation failed")
         return None, 500
 
 
@@ -248,8 +260,8 @@ def get_user_info(user_id):
             }
             return {"status": "success", "user": user_info}, 200
 
-    except Exception as e:
-        print("Error in get_user_info:", e)
+    except Exception:
+        logger.exception("Error in get_user_info for user_id %s", user_id)
         return {"status": "failed", "reason": "Error retrieving user info"}, 500
 
 
@@ -276,16 +288,16 @@ def get_permission(user_id: int):
                 permission_level = row[0]
                 # Handle case where permission might be NULL in DB, though default is 1
                 if permission_level is None:
-                     print(f"Permission is NULL in DB for user_id: {user_id}. Returning None.")
+                    logger.warning("Permission is NULL in DB for user_id: %s. Returning None.", user_id)
             else:
-                print(f"User not found when retrieving permission for user_id: {user_id}")
+                logger.warning("User not found when retrieving permission for user_id: %s", user_id)
                 permission_level = None # Explicitly None if user not found
 
     except psycopg2.Error as db_err:
-        print(f"Database error retrieving permission for user_id {user_id}: {db_err}")
+        logger.error("Database error retrieving permission for user_id %s: %s", user_id, db_err)
         permission_level = None # Return None on DB error
-    except Exception as e:
-        print(f"Unexpected error retrieving permission for user_id {user_id}: {e}")
+    except Exception:
+        logger.exception("Unexpected error retrieving permission for user_id %s", user_id)
         permission_level = None # Return None on unexpected error
 
     return permission_level
@@ -304,8 +316,8 @@ def logout_user(session_id):
                 # No row was deleted -> session didn't exist
                 return {"status": "failed", "reason": "Session not found"}, 404
             return {"status": "success", "reason": "Logged out successfully"}, 200
-    except Exception as e:
-        print(f"Error logging out: {e}")
+    except Exception:
+        logger.exception("Error logging out")
         return {"status": "failed", "reason": "Logout failed"}, 500
 
 
@@ -354,8 +366,8 @@ def change_password(user_id: int, data: dict):
                             # but it's a safeguard.
                             response_dict = {"status": "failed", "reason": "Failed to update password in database."}
                             # http_status_code remains 500
-    except Exception as e:
-        print(f"TODO: Change password exception for user_id {user_id}: {e}")
+    except Exception:
+        logger.exception("Change password failed for user_id %s", user_id)
         # response_dict and http_status_code are already set to a default server error
 
     return response_dict, http_status_code
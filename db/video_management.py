@@ -5,6 +5,23 @@ from db.DB import DB
 
 logger = logging.getLogger(__name__)
 
+# Playlists a user can access: own or public ones, plus non-private ones they subscribe to.
+# Expects a %(user_id)s parameter.
+_ACCESSIBLE_PLAYLISTS_CTE = """
+    accessible_playlists AS (
+        SELECT p.playlist_id
+          FROM "Playlist" p
+         WHERE p.user_id = %(user_id)s
+            OR p.permission = 'public'
+        UNION
+        SELECT s.playlist_id
+          FROM "Subscription" s
+          JOIN "Playlist" pl ON pl.playlist_id = s.playlist_id
+         WHERE s.user_id = %(user_id)s
+           AND pl.permission != 'private'
+    )
+"""
+
 
 def upload_video(data, user_id):
     """
@@ -194,121 +211,186 @@ def get_accessible_videos(user_id):
 
     try:
         with DB.get_cursor() as cur:
-            sql = """
-                WITH accessible_playlists AS (
-                    SELECT p.playlist_id
-                      FROM "Playlist" p
-                     WHERE p.user_id = %(user_id)s
-                        OR p.permission = 'public'
-                    UNION
-                    SELECT s.playlist_id
-                      FROM "Subscription" s
-                      JOIN "Playlist" pl ON pl.playlist_id = s.playlist_id
-                     WHERE s.user_id = %(user_id)s
-                       AND pl.permission != 'private'
-                )
-                SELECT
-                  p.playlist_id,
-                  p.playlist_name,
-                  p.permission as playlist_permission,
-                  p.user_id as owner_id,
-                  ou.first_name as owner_first_name,
-                  ou.last_name as owner_last_name,
-                  pi.playlist_item_id,
-                  v.video_id,
-                  v.name AS video_name,
-                  v.description AS video_desc,
-                  v.subject_name AS subject,
-                  v.youtube_id AS external_id,
-                  v.upload_by,
-                  v."length",
-                  w.watch_item_id,
-                  w."current_time",
-                  w.last_updated,
-                  v.added_date
-                FROM accessible_playlists a
-                JOIN "Playlist" p ON p.playlist_id = a.playlist_id
-                JOIN "User" ou ON ou.user_id = p.user_id
-                JOIN "Playlist_Item" pi ON pi.playlist_id = p.playlist_id
-                JOIN "Video" v ON v.video_id = pi.video_id
-                LEFT JOIN "Watch_Item" w 
-                       ON w.youtube_id = v.youtube_id
-                      AND w.user_id = %(user_id)s
-                ORDER BY p.playlist_id, pi.playlist_item_id;
-            """
-
-            cur.execute(sql, {"user_id": user_id})
-            rows = cur.fetchall()
-
-            # We'll group by playlist_id to build a nested structure.
-            # Key = playlist_id, Value = dict with playlist info + items list.
-            playlists_map = {}
-
-            for row in rows:
-                # Break out each field from the row
-                playlist_id = row[0]
-                playlist_name = row[1]
-                playlist_permission = row[2]
-                owner_id = row[3]
-                owner_first_name = row[4]
-                owner_last_name = row[5]
-                playlist_item_id = row[6]
-                video_id = row[7]
-                video_name = row[8]
-                video_desc = row[9]
-                subject = row[10]
-                external_id = row[11]
-                upload_by = row[12]
-                length = row[13]
-                watch_item_id = row[14]
-                current_time = row[15]
-                last_updated = row[16]
-                added_date = row[17]
-
-                # If we haven't seen this playlist yet, create a dict for it.
-                if playlist_id not in playlists_map:
-                    owner_full_name = f"{owner_first_name} {owner_last_name}".strip()
-                    playlists_map[playlist_id] = {
-                        "playlist_id": playlist_id,
-                        "playlist_name": playlist_name,
-                        "playlist_permission": playlist_permission,
-                        "playlist_owner_name": owner_full_name,
-                        "playlist_owner_id": owner_id,
-                        "playlist_items": []
-                    }
-
-                # Build the watch_item sub-dict only if watch_item_id is present.
-                watch_item_data = None
-                if watch_item_id is not None:
-                    watch_item_data = {
-                        "watch_item_id": watch_item_id,
-                        "current_time": current_time,
-                        "last_updated": str(last_updated) if last_updated else None
-                    }
-
-                # Add the item for this video
-                playlists_map[playlist_id]["playlist_items"].append({
-                    "playlist_item_id": playlist_item_id,
-                    "video_id": video_id,
-                    "video_name": video_name,
-                    "description": video_desc,
-                    "added_date": added_date,
-                    "subject": subject,
-                    "external_id": external_id,
-                    "upload_by": upload_by,
-                    "length": str(length) if length else None,
-                    "watch_item": watch_item_data
-                })
-
-            # Convert the dictionary to a list for final JSON output
-            playlists_list = list(playlists_map.values())
-            return {
-                "status": "success",
-                "playlists": playlists_list
-            }
+            return get_accessible_videos_with_cursor(cur, user_id)
     except Exception as e:
         print(e)
         return {
             "status": "failed",
             "reason": "error retrieving accessible videos"
-        }
\ No newline at end of file
+        }
+
+
+def get_accessible_videos_with_cursor(cur, user_id):
+    """
+    Same result as get_accessible_videos, but runs on the caller's cursor so the read shares
+    the caller's connection and transaction. Database errors propagate to the caller.
+    """
+    sql = f"""
+        WITH {_ACCESSIBLE_PLAYLISTS_CTE}
+        SELECT
+          p.playlist_id,
+          p.playlist_name,
+          p.permission as playlist_permission,
+          p.user_id as owner_id,
+          ou.first_name as owner_first_name,
+          ou.last_name as owner_last_name,
+          pi.playlist_item_id,
+          v.video_id,
+          v.name AS video_name,
+          v.description AS video_desc,
+          v.subject_name AS subject,
+          v.youtube_id AS external_id,
+          v.upload_by,
+          v."length",
+          w.watch_item_id,
+          w."current_time",
+          w.last_updated,
+          v.added_date
+        FROM accessible_playlists a
+        JOIN "Playlist" p ON p.playlist_id = a.playlist_id
+        JOIN "User" ou ON ou.user_id = p.user_id
+        JOIN "Playlist_Item" pi ON pi.playlist_id = p.playlist_id
+        JOIN "Video" v ON v.video_id = pi.video_id
+        LEFT JOIN "Watch_Item" w 
+               ON w.youtube_id = v.youtube_id
+              AND w.user_id = %(user_id)s
+        ORDER BY p.playlist_id, pi.playlist_item_id;
+    """
+
+    cur.execute(sql, {"user_id": user_id})
+    rows = cur.fetchall()
+
+    # We'll group by playlist_id to build a nested structure.
+    # Key = playlist_id, Value = dict with playlist info + items list.
+    playlists_map = {}
+
+    for row in rows:
+        # Break out each field from the row
+        playlist_id = row[0]
+        playlist_name = row[1]
+        playlist_permission = row[2]
+        owner_id = row[3]
+        owner_first_name = row[4]
+        owner_last_name = row[5]
+        playlist_item_id = row[6]
+        video_id = row[7]
+        video_name = row[8]
+        video_desc = row[9]
+        subject = row[10]
+        external_id = row[11]
+        upload_by = row[12]
+        length = row[13]
+        watch_item_id = row[14]
+        current_time = row[15]
+        last_updated = row[16]
+        added_date = row[17]
+
+        # If we haven't seen this playlist yet, create a dict for it.
+        if playlist_id not in playlists_map:
+            owner_full_name = f"{owner_first_name} {owner_last_name}".strip()
+            playlists_map[playlist_id] = {
+                "playlist_id": playlist_id,
+                "playlist_name": playlist_name,
+                "playlist_permission": playlist_permission,
+                "playlist_owner_name": owner_full_name,
+                "playlist_owner_id": owner_id,
+                "playlist_items": []
+            }
+
+        # Build the watch_item sub-dict only if watch_item_id is present.
+        watch_item_data = None
+        if watch_item_id is not None:
+            watch_item_data = {
+                "watch_item_id": watch_item_id,
+                "current_time": current_time,
+                "last_updated": str(last_updated) if last_updated else None
+            }
+
+        # Add the item for this video
+        playlists_map[playlist_id]["playlist_items"].append({
+            "playlist_item_id": playlist_item_id,
+            "video_id": video_id,
+            "video_name": video_name,
+            "description": video_desc,
+            "added_date": added_date,
+            "subject": subject,
+            "external_id": external_id,
+            "upload_by": upload_by,
+            "length": str(length) if length else None,
+            "watch_item": watch_item_data
+        })
+
+    # Convert the dictionary to a list for final JSON output
+    playlists_list = list(playlists_map.values())
+    return {
+        "status": "success",
+        "playlists": playlists_list
+    }
+
+
+def is_video_accessible(cursor, user_id, video_id):
+    """
+    Returns True if the video is in at least one playlist the user can access, i.e. it would
+    appear in get_accessible_videos(user_id). Runs a single EXISTS query on the given cursor
+    instead of loading the user's whole catalog. Database errors propagate to the caller.
+    """
+    cursor.execute(f"""
+        WITH {_ACCESSIBLE_PLAYLISTS_CTE}
+        SELECT EXISTS (
+            SELECT 1
+              FROM accessible_playlists a
+              JOIN "Playlist_Item" pi ON pi.playlist_id = a.playlist_id
+             WHERE pi.video_id = %(item_id)s
+        )
+    """, {"user_id": user_id, "item_id": video_id})
+    return cursor.fetchone()[0]
+
+
+def is_playlist_accessible(cursor, user_id, playlist_id):
+    """
+    Returns True if the user can access the playlist and it appears in get_accessible_videos(user_id)
+    (which only lists playlists that contain videos). Runs a single EXISTS query on the given cursor.
+    Database errors propagate to the caller.
+    """
+    cursor.execute(f"""
+        WITH {_ACCESSIBLE_PLAYLISTS_CTE}
+        SELECT EXISTS (
+            SELECT 1
+              FROM accessible_playlists a
+             WHERE a.playlist_id = %(item_id)s
+               AND EXISTS (SELECT 1 FROM "Playlist_Item" pi WHERE pi.playlist_id = a.playlist_id)
+        )
+    """, {"user_id": user_id, "item_id": playlist_id})
+    return cursor.fetchone()[0]
+
+
+def get_accessible_video_ids(cursor, user_id, video_ids):
+    """
+    Batch form of is_video_accessible: returns the set of ids among `video_ids` that are in at least
+    one playlist the user can access. Runs a single query with = ANY(%s) on the given cursor.
+    Database errors propagate to the caller.
+    """
+    cursor.execute(f"""
+        WITH {_ACCESSIBLE_PLAYLISTS_CTE}
+        SELECT DISTINCT pi.video_id
+          FROM accessible_playlists a
+          JOIN "Playlist_Item" pi ON pi.playlist_id = a.playlist_id
+         WHERE pi.video_id = ANY(%(item_ids)s)
+    """, {"user_id": user_id, "item_ids": list(video_ids)})
+    return {row[0] for row in cursor.fetchall()}
+
+
+def get_accessible_playlist_ids(cursor, user_id, playlist_ids):
+    """
+    Batch form of is_playlist_accessible: returns the set of ids among `playlist_ids` that the user
+    can access and that contain videos. Runs a single query with = ANY(%s) on the given cursor.
+    Database errors propagate to the caller.
+    """
+    cursor.execute(f"""
+        WITH {_ACCESSIBLE_PLAYLISTS_CTE}
+        SELECT a.playlist_id
+          FROM accessible_playlists a
+         WHERE a.playlist_id = ANY(%(item_ids)s)
+           AND EXISTS (SELECT 1 FROM "Playlist_Item" pi WHERE pi.playlist_id = a.playlist_id)
+    """, {"user_id": user_id, "item_ids": list(playlist_ids)})
+    return {row[0] for row in cursor.fetchall()}
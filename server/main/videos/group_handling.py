@@ -59,6 +59,7 @@ def update_existing_group():
 def get_user_group_names():
     """
         Endpoint to retrieve all group names and basic details for the authenticated user.
+        Optional query params for keyset pagination: limit=<int>, after=<group_name from next_cursor>
         """
     response_payload = {"status": "failed", "reason": "Failed to retrieve group names"}
     status_code = 500
@@ -67,7 +68,8 @@ def get_user_group_names():
     if auth_resp:
         return auth_resp, auth_status
 
-    response_payload, status_code = db_api.get_group_names(user_id)
+    response_payload, status_code = db_api.get_group_names(
+        user_id, after_name=request.args.get('after'), limit=request.args.get('limit', type=int))
 
     return jsonify(response_payload), status_code
 
@@ -76,6 +78,7 @@ def get_user_group_names():
 def get_all_user_groups_with_items():
     """
         Endpoint to retrieve all groups and their items (videos, playlists) for the authenticated user.
+        Optional query params for keyset pagination: limit=<int>, after=<group_name from next_cursor>
         """
     response_payload = {"status": "failed", "reason": "Failed to retrieve groups"}
     status_code = 500
@@ -84,7 +87,8 @@ def get_all_user_groups_with_items():
     if auth_resp:
         return auth_resp, auth_status
 
-    response_payload, status_code = db_api.get_groups(user_id)
+    response_payload, status_code = db_api.get_groups(
+        user_id, after_name=request.args.get('after'), limit=request.args.get('limit', type=int))
 
     return jsonify(response_payload), status_code
 
@@ -155,6 +159,30 @@ def add_item_to_group_endpoint():
     return jsonify(response_payload), status_code
 
 
+@groups_bp.route('/items/batch', methods=['POST'])
+def add_items_to_group_endpoint():
+    """
+        Endpoint to add several items of the same type to a group in one request.
+        If the group doesn't exist, it's created.
+        Payload: {"group_name": <string>, "item_type": <"video" or "playlist">, "item_ids": [<int>, ...]}
+        """
+    response_payload = {"status": "failed", "reason": "Failed to add items to group"}
+    status_code = 500
+
+    auth_resp, user_id, auth_status = get_authenticated_user(min_permission=MIN_PERMISSION_LEVEL)
+    if auth_resp:
+        return auth_resp, auth_status
+
+    data = request.get_json()
+    if not data:
+        response_payload = {"status": "failed", "reason": "Invalid JSON payload"}
+        status_code = 400
+    else:
+        response_payload, status_code = db_api.insert_group_items(data, user_id)
+
+    return jsonify(response_payload), status_code
+
+
 @groups_bp.route('/items', methods=['DELETE'])
 def remove_item_from_group_endpoint():
     """
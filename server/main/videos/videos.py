@@ -96,7 +96,8 @@ def remove_from_pl():
         return resp, status
 
     data = request.get_json()
-    # remove_from_playlist expects the user_id and a JSON payload containing the playlist_item_id.
+    # remove_from_playlist expects the user_id and a JSON payload containing the playlist_item_id
+    # (or "playlist_item_ids", a list, to remove several items at once).
     response, code = remove_from_playlist(user_id, data)
     return jsonify(response), code
 